@@ -0,0 +1,208 @@
+import asyncio
+import json
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Optional, Tuple
+
+from app.token_cache import token_cache
+from app.utils import verify_token
+
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "true").lower() == "true"
+# Requests of one class allowed past the gate at once; the rest wait in its queue. Together they
+# stay below the connection pool (40), so every admitted request can get a connection and a
+# threadpool worker cannot sit waiting for a connection held by a request with no worker.
+ADMISSION_AUTH_CONCURRENCY = int(os.getenv("ADMISSION_AUTH_CONCURRENCY", "4"))
+ADMISSION_WRITE_CONCURRENCY = int(os.getenv("ADMISSION_WRITE_CONCURRENCY", "8"))
+ADMISSION_READ_CONCURRENCY = int(os.getenv("ADMISSION_READ_CONCURRENCY", "24"))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "100"))
+ADMISSION_QUEUE_TIMEOUT_MS = int(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "2000"))
+# Per user (or client address without a valid token); 0 turns rate limiting off.
+RATE_LIMIT_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", "0"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", str(2 * RATE_LIMIT_PER_SECOND)))
+RATE_LIMIT_CLIENTS = 10000
+
+# Password hashing is the most expensive thing a request can ask for.
+AUTH_PATHS = {"/token", "/register"}
+EXEMPT_PATHS = {"/metrics"}
+
+
+def route_class(method: str, path: str) -> str:
+    if method == "POST" and path in AUTH_PATHS:
+        return "auth"
+    if method in ("GET", "HEAD", "OPTIONS"):
+        return "read"
+    return "write"
+
+
+class Gate:
+    """Concurrency limit for one route class with a bounded FIFO of waiters.
+
+    Only touched from the event loop, so the counters need no lock. A
+    finishing request hands its slot straight to the oldest waiter.
+    """
+
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.waiters: deque = deque()
+        self.admitted = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "timeout": 0}
+
+    async def acquire(self) -> Optional[str]:
+        """None once admitted, otherwise why the request was shed."""
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            self.admitted += 1
+            return None
+        if len(self.waiters) >= self.queue_size:
+            self.shed["queue_full"] += 1
+            return "queue_full"
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            self.shed["timeout"] += 1
+            return "timeout"
+        except asyncio.CancelledError:
+            # Cancelled after release() handed this waiter the slot: pass it on.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self.waiters.remove(waiter)
+                except ValueError:
+                    pass
+        self.admitted += 1
+        return None
+
+    def release(self):
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    @property
+    def queued(self) -> int:
+        return len(self.waiters)
+
+
+class RateLimiter:
+    """Token bucket per client key, the least recently seen clients forgotten past RATE_LIMIT_CLIENTS."""
+
+    def __init__(self, rate: float, burst: float, maxsize: int = RATE_LIMIT_CLIENTS):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.limited = 0
+
+    def retry_after(self, key: str, now: Optional[float] = None) -> float:
+        """0 when key may proceed (and a token is taken), otherwise seconds until it may."""
+        now = time.monotonic() if now is None else now
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+            self.limited += 1
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+def client_key(scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                payload = token_cache.get(token)
+                if payload is None:
+                    payload = verify_token(token)
+                    if payload is not None:
+                        token_cache.put(token, payload)
+                if payload is not None and payload.get("sub") is not None:
+                    return f"user:{payload['sub']}"
+            break
+    client = scope.get("client")
+    return f"address:{client[0]}" if client else "anonymous"
+
+
+class Admission:
+    def __init__(self):
+        timeout = ADMISSION_QUEUE_TIMEOUT_MS / 1000
+        self.gates = {
+            "auth": Gate(ADMISSION_AUTH_CONCURRENCY, ADMISSION_QUEUE_SIZE, timeout),
+            "write": Gate(ADMISSION_WRITE_CONCURRENCY, ADMISSION_QUEUE_SIZE, timeout),
+            "read": Gate(ADMISSION_READ_CONCURRENCY, ADMISSION_QUEUE_SIZE, timeout),
+        }
+        self.rate_limiter = RateLimiter(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST) if RATE_LIMIT_PER_SECOND > 0 \
+            else None
+
+    def stats(self) -> dict:
+        return {
+            "classes": {
+                name: {"limit": gate.limit, "active": gate.active, "queued": gate.queued, "admitted": gate.admitted,
+                       "shed": dict(gate.shed)}
+                for name, gate in self.gates.items()
+            },
+            "rate_limited": self.rate_limiter.limited if self.rate_limiter is not None else 0,
+        }
+
+
+admission = Admission()
+
+
+async def reject(send, status: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode()
+    await send({"type": "http.response.start", "status": status, "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+        (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+    ]})
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    """Sheds load before it reaches the threadpool and the connection pool.
+
+    Clients over their rate get a 429; requests whose class is at its
+    concurrency limit wait in a bounded queue and get a 503 when it is full
+    or their wait runs past ADMISSION_QUEUE_TIMEOUT_MS. Both carry
+    Retry-After.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        if admission.rate_limiter is not None:
+            wait = admission.rate_limiter.retry_after(client_key(scope))
+            if wait:
+                await reject(send, 429, "Too many requests, slow down", wait)
+                return
+
+        gate = admission.gates[route_class(scope["method"], scope["path"])]
+        reason = await gate.acquire()
+        if reason is not None:
+            await reject(send, 503, "Server is overloaded, please retry", gate.timeout)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
@@ -0,0 +1,81 @@
+import functools
+import inspect
+
+from fastapi import APIRouter, Depends, params
+from fastapi.routing import APIRoute
+
+from app.database import get_db, get_async_db
+from app.routers.auth import get_current_user, get_current_user_async
+
+ASYNC_DEPENDENCIES = {
+    get_db: get_async_db,
+    get_current_user: get_current_user_async,
+}
+
+
+def _swap_dependency(parameter: inspect.Parameter) -> inspect.Parameter:
+    default = parameter.default
+    if isinstance(default, params.Depends) and default.dependency in ASYNC_DEPENDENCIES:
+        return parameter.replace(default=Depends(ASYNC_DEPENDENCIES[default.dependency], use_cache=default.use_cache))
+    return parameter
+
+
+def _is_db_parameter(parameter: inspect.Parameter) -> bool:
+    return isinstance(parameter.default, params.Depends) and parameter.default.dependency is get_db
+
+
+def asyncify_endpoint(endpoint):
+    signature = inspect.signature(endpoint)
+    db_names = [name for name, parameter in signature.parameters.items() if _is_db_parameter(parameter)]
+
+    if inspect.iscoroutinefunction(endpoint):
+        # Async endpoints already go through run_db, which accepts either session.
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            return await endpoint(**kwargs)
+    elif db_names:
+        db_name = db_names[0]
+
+        # The sync body runs on the AsyncSession's sync facade inside a greenlet,
+        # so its queries await aiosqlite instead of blocking a threadpool worker.
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            db = kwargs.pop(db_name)
+            return await db.run_sync(lambda session: endpoint(**kwargs, **{db_name: session}))
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(**kwargs):
+            return endpoint(**kwargs)
+
+    wrapper.__signature__ = signature.replace(
+        parameters=[_swap_dependency(parameter) for parameter in signature.parameters.values()]
+    )
+    return wrapper
+
+
+def asyncify(router: APIRouter) -> APIRouter:
+    """Copy of `router` whose endpoints use AsyncSession instead of get_db."""
+    async_router = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            async_router.routes.append(route)
+            continue
+        async_router.add_api_route(
+            route.path,
+            asyncify_endpoint(route.endpoint),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            deprecated=route.deprecated,
+            methods=route.methods,
+            operation_id=route.operation_id,
+            include_in_schema=route.include_in_schema,
+            response_class=route.response_class,
+            name=route.name,
+        )
+    return async_router
@@ -0,0 +1,77 @@
+"""create base schema
+
+Revision ID: 3a0f6d1c9e52
+Revises:
+Create Date: 2026-10-18 20:06:44.391207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a0f6d1c9e52'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The tables as they were before the first revision, so `alembic upgrade head`
+    # builds the schema from an empty database; databases created by create_all
+    # already have them.
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False, if_not_exists=True)
+    op.create_table(
+        'offices',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_offices_id'), 'offices', ['id'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_offices_location'), 'offices', ['location'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_offices_name'), 'offices', ['name'], unique=False, if_not_exists=True)
+    op.create_table(
+        'rooms',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('capacity', sa.Integer(), nullable=True),
+        sa.Column('office_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['office_id'], ['offices.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_rooms_id'), 'rooms', ['id'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_rooms_name'), 'rooms', ['name'], unique=False, if_not_exists=True)
+    op.create_table(
+        'bookings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=False),
+        sa.Column('room_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_bookings_id'), 'bookings', ['id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_table('bookings')
+    op.drop_table('rooms')
+    op.drop_table('offices')
+    op.drop_table('users')
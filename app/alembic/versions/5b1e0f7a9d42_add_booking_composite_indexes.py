@@ -0,0 +1,30 @@
+"""add booking composite indexes
+
+Revision ID: 5b1e0f7a9d42
+Revises: c33cd5e216f1
+Create Date: 2026-10-18 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e0f7a9d42'
+down_revision: Union[str, None] = 'c33cd5e216f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_bookings_room_id_start_time_end_time', 'bookings',
+                    ['room_id', 'start_time', 'end_time'], unique=False, if_not_exists=True)
+    op.create_index('ix_bookings_user_id_start_time', 'bookings',
+                    ['user_id', 'start_time'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookings_user_id_start_time', table_name='bookings', if_exists=True)
+    op.drop_index('ix_bookings_room_id_start_time_end_time', table_name='bookings', if_exists=True)
@@ -0,0 +1,45 @@
+"""add bookings archive
+
+Revision ID: 7f3b9c2e6a15
+Revises: d4a6f2b8c013
+Create Date: 2026-10-18 19:21:36.804512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3b9c2e6a15'
+down_revision: Union[str, None] = 'd4a6f2b8c013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'bookings_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=False),
+        sa.Column('room_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('series_id', sa.String(), nullable=True),
+        sa.Column('recurrence', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_bookings_archive_room_id_start_time', 'bookings_archive',
+                    ['room_id', 'start_time'], unique=False, if_not_exists=True)
+    op.create_index('ix_bookings_archive_user_id_start_time', 'bookings_archive',
+                    ['user_id', 'start_time'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookings_archive_user_id_start_time', table_name='bookings_archive', if_exists=True)
+    op.drop_index('ix_bookings_archive_room_id_start_time', table_name='bookings_archive', if_exists=True)
+    op.drop_table('bookings_archive')
@@ -0,0 +1,35 @@
+"""add booking recurrence
+
+Revision ID: 9e27c4d1a8b3
+Revises: 5b1e0f7a9d42
+Create Date: 2026-10-18 11:40:07.218530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e27c4d1a8b3'
+down_revision: Union[str, None] = '5b1e0f7a9d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases built by create_all already have the columns.
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('bookings')}
+    if 'series_id' not in columns:
+        op.add_column('bookings', sa.Column('series_id', sa.String(), nullable=True))
+    if 'recurrence' not in columns:
+        op.add_column('bookings', sa.Column('recurrence', sa.String(), nullable=True))
+    op.create_index(op.f('ix_bookings_series_id'), 'bookings', ['series_id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_bookings_series_id'), table_name='bookings')
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.drop_column('recurrence')
+        batch_op.drop_column('series_id')
@@ -0,0 +1,37 @@
+"""bookings autoincrement
+
+Revision ID: a81d5e0c4f97
+Revises: 7f3b9c2e6a15
+Create Date: 2026-10-18 19:48:12.150376
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a81d5e0c4f97'
+down_revision: Union[str, None] = '7f3b9c2e6a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    # AUTOINCREMENT can only be set by rebuilding the table.
+    with op.batch_alter_table('bookings', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+        pass
+    # Start after every id handed out so far, archived ones included.
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'bookings'")
+    op.execute("INSERT INTO sqlite_sequence (name, seq) SELECT 'bookings', coalesce(max(id), 0) "
+               "FROM (SELECT id FROM bookings UNION ALL SELECT id FROM bookings_archive)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('bookings', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+        pass
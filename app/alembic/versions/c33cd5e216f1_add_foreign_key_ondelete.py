@@ -1,7 +1,7 @@
 """add foreign key ondelete
 
 Revision ID: c33cd5e216f1
-Revises: 
+Revises: 3a0f6d1c9e52
 Create Date: 2024-11-19 02:26:50.276144
 
 """
@@ -13,7 +13,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision: str = 'c33cd5e216f1'
-down_revision: Union[str, None] = None
+down_revision: Union[str, None] = '3a0f6d1c9e52'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
@@ -0,0 +1,27 @@
+"""add room office capacity index
+
+Revision ID: d4a6f2b8c013
+Revises: 9e27c4d1a8b3
+Create Date: 2026-10-18 13:05:52.671904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a6f2b8c013'
+down_revision: Union[str, None] = '9e27c4d1a8b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_rooms_office_id_capacity', 'rooms', ['office_id', 'capacity'], unique=False,
+                    if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_rooms_office_id_capacity', table_name='rooms', if_exists=True)
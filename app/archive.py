@@ -0,0 +1,102 @@
+"""Moves bookings that ended long ago from `bookings` to `bookings_archive`.
+
+    python -m app.archive   # one pass, as the server does every BOOKING_ARCHIVE_INTERVAL_SECONDS
+"""
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from app.booking_locks import begin_write
+from app.models import ArchivedBooking, Booking
+
+# Bookings that ended more than this many days ago are archived; 0 turns archival off.
+BOOKING_ARCHIVE_AFTER_DAYS = int(os.getenv("BOOKING_ARCHIVE_AFTER_DAYS", "365"))
+# Rows of `bookings` scanned per transaction.
+BOOKING_ARCHIVE_BATCH_SIZE = int(os.getenv("BOOKING_ARCHIVE_BATCH_SIZE", "1000"))
+BOOKING_ARCHIVE_INTERVAL_SECONDS = int(os.getenv("BOOKING_ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+logger = logging.getLogger("office_booking")
+
+
+def archive_horizon(now: Optional[datetime] = None) -> Optional[datetime]:
+    if BOOKING_ARCHIVE_AFTER_DAYS <= 0:
+        return None
+    return (now or datetime.utcnow()) - timedelta(days=BOOKING_ARCHIVE_AFTER_DAYS)
+
+
+def needs_archive(start_time: Optional[datetime]) -> bool:
+    # Archived bookings ended before the horizon, so a range starting at or
+    # after it cannot contain any of them.
+    horizon = archive_horizon()
+    return horizon is not None and (start_time is None or start_time < horizon)
+
+
+def booking_source(start_time: Optional[datetime] = None):
+    """Booking, or Booking mapped over bookings UNION ALL bookings_archive when the range reaches archived history."""
+    if not needs_archive(start_time):
+        return Booking
+    columns = [column.name for column in ArchivedBooking.__table__.columns]
+    return aliased(Booking, union_all(
+        select(*(Booking.__table__.c[name] for name in columns)),
+        select(*(ArchivedBooking.__table__.c[name] for name in columns)),
+    ).subquery("all_bookings"))
+
+
+def archive_batch(db: Session, horizon: datetime, after_id: int, batch_size: int):
+    """Archive the expired bookings among the next batch_size ids after after_id.
+
+    Returns (bookings moved, last id scanned or None at the end of the table).
+    Runs as one short write transaction so booking writers wait at most for
+    a single batch.
+    """
+    begin_write(db, [])
+    try:
+        rows = db.execute(
+            select(Booking.id, Booking.end_time)
+            .where(Booking.id > after_id).order_by(Booking.id).limit(batch_size)
+        ).all()
+        expired = [row for row in rows if row.end_time < horizon]
+        if expired:
+            ids = [row.id for row in expired]
+            columns = [column.name for column in ArchivedBooking.__table__.columns]
+            db.execute(insert(ArchivedBooking).from_select(
+                columns, select(*(Booking.__table__.c[name] for name in columns)).where(Booking.id.in_(ids))))
+            db.execute(delete(Booking).where(Booking.id.in_(ids)))
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    return len(expired), (rows[-1].id if len(rows) == batch_size else None)
+
+
+def archive_bookings(session_factory, now: Optional[datetime] = None, batch_size: int = BOOKING_ARCHIVE_BATCH_SIZE,
+                     pause: float = 0.01) -> int:
+    """One pass over `bookings`, archiving everything that ended before the horizon."""
+    horizon = archive_horizon(now)
+    if horizon is None:
+        return 0
+    moved, after_id = 0, 0
+    db = session_factory()
+    try:
+        while after_id is not None:
+            count, after_id = archive_batch(db, horizon, after_id, batch_size)
+            moved += count
+            if after_id is not None and pause:
+                time.sleep(pause)
+    finally:
+        db.close()
+    if moved:
+        logger.info("Archived %d bookings that ended before %s", moved, horizon)
+    return moved
+
+
+if __name__ == "__main__":
+    from app.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    print(f"archived {archive_bookings(SessionLocal)} bookings")
@@ -0,0 +1,76 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import List, Optional
+
+
+class RoomIntervals:
+    """Bookings of a single room, kept sorted by start time.
+
+    Bookings of one room never overlap, so sorting by start also sorts by end:
+    the last booking starting before a new end time is the only one that can
+    reach past the new start time.
+    """
+
+    __slots__ = ("starts", "ends", "ids")
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.ids = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _find(self, booking_id: int, start_time: datetime) -> int:
+        lo = bisect_left(self.starts, start_time)
+        hi = bisect_right(self.starts, start_time, lo)
+        for i in range(lo, hi):
+            if self.ids[i] == booking_id:
+                return i
+        return -1
+
+    def add(self, booking_id: int, start_time: datetime, end_time: datetime):
+        if self._find(booking_id, start_time) != -1:
+            return
+        i = bisect_right(self.starts, start_time)
+        self.starts.insert(i, start_time)
+        self.ends.insert(i, end_time)
+        self.ids.insert(i, booking_id)
+
+    def remove(self, booking_id: int, start_time: Optional[datetime] = None) -> bool:
+        i = self._find(booking_id, start_time) if start_time is not None else -1
+        if i == -1:
+            try:
+                i = self.ids.index(booking_id)
+            except ValueError:
+                return False
+        del self.starts[i]
+        del self.ends[i]
+        del self.ids[i]
+        return True
+
+    def overlaps(self, start_time: datetime, end_time: datetime,
+                 exclude_id: Optional[int] = None) -> bool:
+        i = bisect_left(self.starts, end_time) - 1
+        while i >= 0:
+            if self.ids[i] != exclude_id:
+                return self.ends[i] > start_time
+            i -= 1
+        return False
+
+
+def sweep_overlaps(starts: List[datetime], ends: List[datetime],
+                   booked_starts: List[datetime], booked_ends: List[datetime]) -> List[int]:
+    """Indexes of the intervals in starts/ends that overlap a booked interval.
+
+    Both sides must be sorted by start and free of self-overlaps, which makes
+    their ends sorted too, so a single merge pass over the two lists suffices.
+    """
+    conflicts = []
+    j = 0
+    for i, (start_time, end_time) in enumerate(zip(starts, ends)):
+        while j < len(booked_ends) and booked_ends[j] <= start_time:
+            j += 1
+        if j < len(booked_starts) and booked_starts[j] < end_time:
+            conflicts.append(i)
+    return conflicts
@@ -1,20 +1,93 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 
 from sqlalchemy.orm import sessionmaker, declarative_base
+from starlette.concurrency import run_in_threadpool
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
+# Serve requests through AsyncSession/aiosqlite instead of the threadpool.
+DATABASE_ASYNC = os.getenv("DATABASE_ASYNC", "false").lower() == "true"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+# Applied to every new SQLite connection; set SQLITE_PRAGMAS="" to keep SQLite's defaults.
+SQLITE_PRAGMAS = os.getenv(
+    "SQLITE_PRAGMAS",
+    "journal_mode=WAL,synchronous=NORMAL,mmap_size=268435456,cache_size=-65536,busy_timeout=5000,foreign_keys=ON",
 )
+# Sized to the threadpool (40 workers) so handlers do not queue for a connection.
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "20"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "20"))
+
+
+def parse_pragmas(value: str):
+    pragmas = []
+    for item in value.split(","):
+        if item.strip():
+            name, _, setting = item.partition("=")
+            pragmas.append((name.strip(), setting.strip()))
+    return pragmas
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, setting in parse_pragmas(SQLITE_PRAGMAS):
+            cursor.execute(f"PRAGMA {name}={setting}")
+    finally:
+        cursor.close()
+
+
+def is_memory_database(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+def engine_options(url: str) -> dict:
+    # In-memory SQLite gets SQLAlchemy's single-connection pool; files and
+    # other databases get a QueuePool sized for the threadpool.
+    if url.startswith("sqlite") and is_memory_database(url):
+        return {}
+    return {"pool_size": DATABASE_POOL_SIZE, "max_overflow": DATABASE_MAX_OVERFLOW}
+
+
+def create_database_engine(url: str, **kwargs):
+    if not url.startswith("sqlite"):
+        return create_engine(url, **engine_options(url), **kwargs)
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},  # Needed for SQLite
+        **engine_options(url),
+        **kwargs,
+    )
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+engine = create_database_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+async_engine = None
+AsyncSessionLocal = None
+
+
+def async_database_url(url: str) -> str:
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+if DATABASE_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(async_database_url(SQLALCHEMY_DATABASE_URL),
+                                       **engine_options(SQLALCHEMY_DATABASE_URL))
+    if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+        event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -22,3 +95,19 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def run_db(db, fn, *args):
+    """Run fn(session, *args) without blocking the event loop.
+
+    Sync sessions go to the threadpool; an AsyncSession runs fn on its
+    underlying sync session via run_sync.
+    """
+    if hasattr(db, "run_sync"):
+        return await db.run_sync(fn, *args)
+    return await run_in_threadpool(fn, db, *args)
@@ -0,0 +1,60 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from app.utils import get_password_hash, verify_password
+
+
+class HashingPool:
+    """Runs bcrypt on a dedicated thread pool with a bounded backlog.
+
+    bcrypt releases the GIL while hashing, so worker threads hash in parallel
+    while the event loop keeps serving other requests. Once `workers` hashes
+    are running and `queue_limit` more are waiting, new calls fail fast with
+    503 instead of piling up.
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.pending = 0
+        self.rejected = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.workers + self.queue_limit:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent password operations, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            self.pending += 1
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _run(self, fn, *args):
+        future = self._submit(fn, *args)
+        try:
+            return await future
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+
+hashing_pool = HashingPool(
+    workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2))),
+    queue_limit=int(os.getenv("PASSWORD_HASH_QUEUE", "32")),
+)
@@ -0,0 +1,276 @@
+"""Bulk import of offices, rooms and bookings from CSV or JSONL files.
+
+    python -m app.importer offices offices.csv
+    python -m app.importer rooms rooms.jsonl
+    python -m app.importer bookings bookings.csv --user admin@example.com --rejects rejected.jsonl
+
+Rooms name their office by `office_id` or `office` (its name); bookings
+name their room by `room_id` or `office` + `room` and their owner by
+`user_email` (or --user). Files are read one row at a time.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+
+from app.booking_index import RoomIntervals
+from app.models import Booking, Office, Room, User
+from app.schemas import BookingCreate, OfficeCreate, RoomCreate
+from app.utils import end_time_must_be_after_start_time
+
+
+def read_rows(path: str, fmt: Optional[str] = None) -> Iterator[Union[dict, str]]:
+    """CSV rows as dicts and JSONL lines as text; the importer parses each line so a bad one is only rejected."""
+    fmt = fmt or ("csv" if path.endswith(".csv") else "jsonl")
+    with open(path, newline="", encoding="utf-8") as source:
+        if fmt == "csv":
+            for row in csv.DictReader(source):
+                # Empty CSV cells mean "not given", like a missing JSON key.
+                yield {key: value for key, value in row.items() if value != ""}
+        else:
+            for line in source:
+                if line.strip():
+                    yield line
+
+
+def parse_row(row: Union[dict, str]) -> dict:
+    if isinstance(row, str):
+        try:
+            row = json.loads(row)
+        except ValueError as exc:
+            raise ValueError(f"Invalid JSON: {exc}")
+    if not isinstance(row, dict):
+        raise ValueError("Row must be a JSON object")
+    return row
+
+
+def validation_error(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in exc.errors())
+
+
+class ImportReport:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.imported = 0
+        self.rejected = 0
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.imported + self.rejected) / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.kind}: {self.imported} imported, {self.rejected} rejected in {self.seconds:.2f}s "
+                f"({self.rows_per_second:.0f} rows/s)")
+
+
+class Importer:
+    """Validates rows and writes them in executemany chunks, committing every few chunks.
+
+    Offices, rooms and users are resolved through maps loaded once from the
+    database and extended with every inserted row. Bookings are checked for
+    overlaps against a sorted interval list per room, loaded the first time
+    the room appears in the file.
+    """
+
+    def __init__(self, engine, chunk_size: int = 5000, chunks_per_transaction: int = 10,
+                 default_user: Optional[str] = None, rejects=None):
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.chunks_per_transaction = chunks_per_transaction
+        self.default_user = default_user
+        self.rejects = rejects
+        self._offices: Optional[Dict[str, Optional[int]]] = None
+        self._office_ids: Optional[set] = None
+        self._rooms: Optional[Dict[Tuple[int, str], Optional[int]]] = None
+        self._room_ids: Optional[set] = None
+        self._users: Optional[Dict[str, int]] = None
+
+    def _reject(self, report: ImportReport, line: int, row: dict, error: str):
+        report.rejected += 1
+        if self.rejects is not None:
+            self.rejects.write(json.dumps({"kind": report.kind, "line": line, "error": error, "row": row},
+                                          default=str) + "\n")
+
+    def _write(self, conn, model, rows: Iterable[dict], report: ImportReport, returning=None, on_inserted=None):
+        chunk, chunks = [], 0
+
+        def flush():
+            nonlocal chunk, chunks
+            if returning is None:
+                conn.execute(insert(model), chunk)
+            else:
+                for inserted in conn.execute(insert(model).returning(*returning), chunk):
+                    on_inserted(inserted)
+            report.imported += len(chunk)
+            chunk, chunks = [], chunks + 1
+            if chunks % self.chunks_per_transaction == 0:
+                conn.commit()
+
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == self.chunk_size:
+                flush()
+        if chunk:
+            flush()
+        conn.commit()
+
+    def _run(self, kind: str, model, rows: Iterable[dict], validate, returning=None, on_inserted=None):
+        report = ImportReport(kind)
+        with self.engine.connect() as conn:
+            def valid_rows():
+                for line, row in enumerate(rows, start=1):
+                    try:
+                        row = parse_row(row)
+                        yield validate(conn, row)
+                    except (ValidationError, ValueError) as exc:
+                        error = validation_error(exc) if isinstance(exc, ValidationError) else str(exc)
+                        self._reject(report, line, row, error)
+
+            self._write(conn, model, valid_rows(), report, returning, on_inserted)
+        report.seconds = time.perf_counter() - report.started
+        return report
+
+    def _load_offices(self, conn):
+        if self._offices is None:
+            self._offices, self._office_ids = {}, set()
+            for office_id, name in conn.execute(select(Office.id, Office.name)):
+                self._add_office(office_id, name)
+
+    def _add_office(self, office_id: int, name: str):
+        # Names shared by several offices cannot be used as a reference.
+        self._offices[name] = None if name in self._offices else office_id
+        self._office_ids.add(office_id)
+
+    def _office_id(self, conn, row: dict) -> int:
+        self._load_offices(conn)
+        if "office_id" in row:
+            office_id = int(row["office_id"])
+            if office_id not in self._office_ids:
+                raise ValueError(f"Unknown office_id {office_id}")
+            return office_id
+        name = row.get("office")
+        if name not in self._offices:
+            raise ValueError(f"Unknown office {name!r}")
+        if self._offices[name] is None:
+            raise ValueError(f"Office name {name!r} is not unique, use office_id")
+        return self._offices[name]
+
+    def _load_rooms(self, conn):
+        if self._rooms is None:
+            self._rooms, self._room_ids = {}, set()
+            for room_id, office_id, name in conn.execute(select(Room.id, Room.office_id, Room.name)):
+                self._add_room(room_id, office_id, name)
+
+    def _add_room(self, room_id: int, office_id: int, name: str):
+        key = (office_id, name)
+        self._rooms[key] = None if key in self._rooms else room_id
+        self._room_ids.add(room_id)
+
+    def _room_id(self, conn, row: dict) -> int:
+        self._load_rooms(conn)
+        if "room_id" in row:
+            room_id = int(row["room_id"])
+            if room_id not in self._room_ids:
+                raise ValueError(f"Unknown room_id {room_id}")
+            return room_id
+        key = (self._office_id(conn, row), row.get("room"))
+        if key not in self._rooms:
+            raise ValueError(f"Unknown room {row.get('room')!r} in office {row.get('office')!r}")
+        if self._rooms[key] is None:
+            raise ValueError(f"Room name {row.get('room')!r} is not unique in its office, use room_id")
+        return self._rooms[key]
+
+    def _user_id(self, conn, row: dict) -> int:
+        if self._users is None:
+            self._users = {email: user_id for user_id, email in conn.execute(select(User.id, User.email))}
+        email = row.get("user_email", self.default_user)
+        if email not in self._users:
+            raise ValueError(f"Unknown user {email!r}")
+        return self._users[email]
+
+    def offices(self, rows: Iterable[dict]) -> ImportReport:
+        def validate(conn, row):
+            self._load_offices(conn)
+            return OfficeCreate(**row).dict()
+
+        return self._run("offices", Office, rows, validate, (Office.id, Office.name),
+                         lambda inserted: self._add_office(*inserted))
+
+    def rooms(self, rows: Iterable[dict]) -> ImportReport:
+        def validate(conn, row):
+            self._load_rooms(conn)
+            room = {key: value for key, value in row.items() if key != "office"}
+            room["office_id"] = self._office_id(conn, row)
+            return RoomCreate(**room).dict()
+
+        return self._run("rooms", Room, rows, validate, (Room.id, Room.office_id, Room.name),
+                         lambda inserted: self._add_room(*inserted))
+
+    def bookings(self, rows: Iterable[dict]) -> ImportReport:
+        intervals: Dict[int, RoomIntervals] = {}
+        placeholder_ids = iter(range(-1, -sys.maxsize, -1))
+
+        def room_intervals(conn, room_id: int) -> RoomIntervals:
+            room = intervals.get(room_id)
+            if room is None:
+                room = intervals[room_id] = RoomIntervals()
+                for booking_id, start_time, end_time in conn.execute(
+                        select(Booking.id, Booking.start_time, Booking.end_time)
+                        .where(Booking.room_id == room_id).order_by(Booking.start_time)):
+                    room.starts.append(start_time)
+                    room.ends.append(end_time)
+                    room.ids.append(booking_id)
+            return room
+
+        def validate(conn, row):
+            booking = {key: value for key, value in row.items() if key not in ("office", "room", "user_email")}
+            booking["room_id"] = self._room_id(conn, row)
+            booking = BookingCreate(**booking)
+            if booking.recurrence is not None:
+                raise ValueError("recurrence cannot be imported")
+            if end_time_must_be_after_start_time(start_time=booking.start_time, end_time=booking.end_time):
+                raise ValueError("end_time must be after start_time")
+            user_id = self._user_id(conn, row)
+            room = room_intervals(conn, booking.room_id)
+            if room.overlaps(booking.start_time, booking.end_time):
+                raise ValueError("Room is already booked for this time period")
+            room.add(next(placeholder_ids), booking.start_time, booking.end_time)
+            return dict(booking.dict(exclude={"recurrence"}), user_id=user_id)
+
+        return self._run("bookings", Booking, rows, validate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("kind", choices=("offices", "rooms", "bookings"))
+    parser.add_argument("path", help="CSV or JSONL file")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+    parser.add_argument("--user", help="email of the owner of bookings without a user_email column")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="rows per executemany")
+    parser.add_argument("--transaction-chunks", type=int, default=10, help="chunks per committed transaction")
+    parser.add_argument("--rejects", help="write rejected rows with their errors to this JSONL file")
+    args = parser.parse_args()
+
+    from app.database import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    rejects = open(args.rejects, "w", encoding="utf-8") if args.rejects else None
+    try:
+        importer = Importer(engine, args.chunk_size, args.transaction_chunks, args.user, rejects)
+        report = getattr(importer, args.kind)(read_rows(args.path, args.format))
+    finally:
+        if rejects is not None:
+            rejects.close()
+    print(report)
+    sys.exit(1 if report.rejected else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import time
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List, Optional
+
+# Hand records to a background thread instead of writing them on the request path.
+LOG_QUEUE = os.getenv("LOG_QUEUE", "true").lower() == "true"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+ACCESS_LOG = os.getenv("ACCESS_LOG", "true").lower() == "true"
+# Share of successful GET/HEAD requests written to the access log; everything else is always written.
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "0.1"))
+FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+MAX_BYTES = 10000000  # 10MB
+
+access_logger = logging.getLogger("office_booking.access")
+SLOW_SQL_LOGGER = "office_booking.slow_sql"
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queues records without blocking; a full queue drops them and counts the loss."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # The listener formats the record, off the request path.
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # handle() holds the handler lock here, so the count is exact.
+            self.dropped += 1
+
+
+class AccessFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(record.msg, separators=(",", ":"))
+
+
+def only(name: str):
+    return lambda record: record.name == name or record.name.startswith(name + ".")
+
+
+def excluding(name: str):
+    return lambda record: not only(name)(record)
+
+
+def file_handler(path: str, formatter: logging.Formatter, log_filter) -> logging.Handler:
+    handler = RotatingFileHandler(path, maxBytes=MAX_BYTES, backupCount=5)
+    handler.setFormatter(formatter)
+    handler.addFilter(log_filter)
+    return handler
+
+
+def build_handlers() -> List[logging.Handler]:
+    """app.log and stderr get everything but access records; the slow SQL and access logs get their own files."""
+    formatter = logging.Formatter(FORMAT)
+    stream = logging.StreamHandler()
+    stream.setFormatter(formatter)
+    stream.addFilter(excluding(access_logger.name))
+    return [
+        file_handler("logs/app.log", formatter, excluding(access_logger.name)),
+        stream,
+        file_handler("logs/slow_queries.log", logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'),
+                     only(SLOW_SQL_LOGGER)),
+        file_handler("logs/access.log", AccessFormatter(), only(access_logger.name)),
+    ]
+
+
+queue_handler: Optional[DroppingQueueHandler] = None
+
+
+def dropped_records() -> int:
+    return queue_handler.dropped if queue_handler is not None else 0
+
+
+def setup_logging():
+    global queue_handler
+    os.makedirs("logs", exist_ok=True)
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    handlers = build_handlers()
+    if not LOG_QUEUE:
+        for handler in handlers:
+            root.addHandler(handler)
+        return
+    queue_handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # Drains what is still queued before the process exits.
+    atexit.register(listener.stop)
+    root.addHandler(queue_handler)
+
+
+current_access: ContextVar[Optional[dict]] = ContextVar("current_access", default=None)
+
+
+def set_user(user_id: int):
+    entry = current_access.get()
+    if entry is not None:
+        entry["user_id"] = user_id
+
+
+class AccessLogMiddleware:
+    """Writes one compact JSON line per request: method, path, status, latency and user id."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        entry = {"method": scope["method"], "path": scope["path"], "status": 500, "user_id": None}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                entry["status"] = message["status"]
+            await send(message)
+
+        token = current_access.set(entry)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            current_access.reset(token)
+            entry["ms"] = round((time.perf_counter() - started) * 1000, 2)
+            log_access(entry)
+
+
+def log_access(entry: dict):
+    # Successful reads are sampled; writes and errors are always logged.
+    if entry["method"] in ("GET", "HEAD") and entry["status"] < 400:
+        if random.random() >= ACCESS_LOG_SAMPLE_RATE:
+            return
+        entry["sample_rate"] = ACCESS_LOG_SAMPLE_RATE
+    entry["ts"] = round(time.time(), 3)
+    access_logger.info(entry)
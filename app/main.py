@@ -1,44 +1,101 @@
+import asyncio
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import time
+from contextlib import asynccontextmanager
+
+from app.startup import StartupTimer
+
+# Started before the framework and app imports so the report covers them.
+startup = StartupTimer()
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi_pagination import add_pagination
+from starlette.concurrency import run_in_threadpool
 
-from app.database import engine, Base
-from app.routers import auth, office, room, booking
-
-# Configure logging
-if not os.path.exists("logs"):
-    os.makedirs("logs")
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        RotatingFileHandler(
-            "logs/app.log",
-            maxBytes=10000000,  # 10MB
-            backupCount=5
-        ),
-        logging.StreamHandler()
-    ]
-)
+from app.database import engine, async_engine, Base, SessionLocal, DATABASE_ASYNC
+from app.admission import ADMISSION_CONTROL, AdmissionMiddleware
+from app.aio import asyncify
+from app.archive import BOOKING_ARCHIVE_INTERVAL_SECONDS, archive_bookings, archive_horizon
+from app.log_pipeline import ACCESS_LOG, AccessLogMiddleware, setup_logging
+from app.metrics import METRICS_ENABLED, MetricsMiddleware, instrument, metrics
+from app import profiler
+from app.routers import auth, office, room, booking, availability
 
-# Create logger
+startup.mark("imports", startup.started)
+with startup.phase("logging"):
+    setup_logging()
 logger = logging.getLogger("office_booking")
-Base.metadata.create_all(bind=engine)
+# Off by default: Alembic owns the schema, and creating it at startup costs every worker a round of DDL checks.
+DATABASE_CREATE_SCHEMA = os.getenv("DATABASE_CREATE_SCHEMA", "false").lower() == "true"
+
+
+async def archive_periodically():
+    while True:
+        try:
+            await run_in_threadpool(archive_bookings, SessionLocal)
+        except Exception:
+            logger.exception("Booking archival failed")
+        await asyncio.sleep(BOOKING_ARCHIVE_INTERVAL_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DATABASE_CREATE_SCHEMA:
+        with startup.phase("schema"):
+            Base.metadata.create_all(bind=engine)
+    archiver = None
+    if archive_horizon() is not None and BOOKING_ARCHIVE_INTERVAL_SECONDS > 0:
+        archiver = asyncio.create_task(archive_periodically())
+    startup.report()
+    yield
+    if archiver is not None:
+        archiver.cancel()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+app_started = time.perf_counter()
 app = FastAPI(
     title="Office Booking Service",
+    lifespan=lifespan,
 )
+routers = [
+    (auth.router, ["authentication"]),
+    (office.router, ["offices"]),
+    (room.router, ["rooms"]),
+    (booking.router, ["booking"]),
+    (availability.router, ["availability"]),
+]
+app.add_middleware(profiler.ProfileMiddleware)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+for sync_engine in [engine] + ([async_engine.sync_engine] if async_engine is not None else []):
+    profiler.instrument(sync_engine)
+    if METRICS_ENABLED:
+        instrument(sync_engine)
+if ADMISSION_CONTROL:
+    # Outside metrics, which then only time admitted requests.
+    app.add_middleware(AdmissionMiddleware)
+if ACCESS_LOG:
+    # Outermost, so its latency covers the other middleware as well.
+    app.add_middleware(AccessLogMiddleware)
+if DATABASE_ASYNC:
+    routers = [(asyncify(router), tags) for router, tags in routers]
+for router, tags in routers:
+    app.include_router(router, tags=tags)
 add_pagination(app)
-app.include_router(auth.router, tags=["authentication"])
-app.include_router(office.router, tags=["offices"])
-app.include_router(room.router, tags=["rooms"])
-app.include_router(booking.router, tags=["booking"])
+startup.mark("app", app_started)
 
 
 @app.get("/")
 def root():
     return {"message": "Welcome to the Office Room Booking System API"}
+
+
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def read_metrics():
+        # async so rendering runs on the event loop, the only writer of the counters
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,247 @@
+import functools
+import inspect
+import os
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.admission import admission
+from app.log_pipeline import dropped_records
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self):
+        # One slot per bucket plus +Inf, allocated once.
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+
+
+class RequestStats:
+    """Query and section timings of one request.
+
+    Only the request itself writes to it: the handler's thread, or its
+    greenlet under AsyncSession.run_sync.
+    """
+
+    __slots__ = ("queries", "query_seconds", "sections")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.sections: Dict[str, float] = {}
+
+    def add_section(self, section: str, seconds: float):
+        self.sections[section] = self.sections.get(section, 0.0) + seconds
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+class Metrics:
+    """Process-wide counters, only ever updated on the event loop thread.
+
+    Handlers running in worker threads write to their own RequestStats;
+    the middleware folds those into these totals once the response has
+    been sent, so no counter needs a lock.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.responses: Dict[Tuple[str, str, int], int] = {}
+        self.queries: Dict[Tuple[str, str], int] = {}
+        self.query_seconds: Dict[Tuple[str, str], float] = {}
+        self.sections: Dict[str, Histogram] = {}
+
+    def record(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        key = (method, route)
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram()
+        histogram.observe(seconds)
+        self.responses[method, route, status] = self.responses.get((method, route, status), 0) + 1
+        self.queries[key] = self.queries.get(key, 0) + stats.queries
+        self.query_seconds[key] = self.query_seconds.get(key, 0.0) + stats.query_seconds
+        for section, section_seconds in stats.sections.items():
+            histogram = self.sections.get(section)
+            if histogram is None:
+                histogram = self.sections[section] = Histogram()
+            histogram.observe(section_seconds)
+
+    def clear(self):
+        self.__init__()
+
+    def render(self) -> str:
+        lines = [
+            "# HELP office_booking_requests_in_flight Requests currently being served.",
+            "# TYPE office_booking_requests_in_flight gauge",
+            f"office_booking_requests_in_flight {self.in_flight}",
+        ]
+        lines += render_histograms(
+            "office_booking_request_duration_seconds", "Request latency by route.",
+            {f'method="{method}",route="{route}"': histogram for (method, route), histogram in self.latency.items()})
+        lines += [
+            "# HELP office_booking_responses_total Responses by route and status code.",
+            "# TYPE office_booking_responses_total counter",
+        ]
+        lines += [f'office_booking_responses_total{{method="{method}",route="{route}",status="{status}"}} {count}'
+                  for (method, route, status), count in self.responses.items()]
+        lines += [
+            "# HELP office_booking_db_queries_total SQL statements executed by route.",
+            "# TYPE office_booking_db_queries_total counter",
+        ]
+        lines += [f'office_booking_db_queries_total{{method="{method}",route="{route}"}} {count}'
+                  for (method, route), count in self.queries.items()]
+        lines += [
+            "# HELP office_booking_db_query_seconds_total Time spent in SQL statements by route.",
+            "# TYPE office_booking_db_query_seconds_total counter",
+        ]
+        lines += [f'office_booking_db_query_seconds_total{{method="{method}",route="{route}"}} {seconds:.6f}'
+                  for (method, route), seconds in self.query_seconds.items()]
+        lines += render_histograms(
+            "office_booking_section_duration_seconds",
+            "Time per request in get_current_user, check_booking_conflict and pagination counts.",
+            {f'section="{section}"': histogram for section, histogram in self.sections.items()})
+        lines += [
+            "# HELP office_booking_log_records_dropped_total Log records dropped because the log queue was full.",
+            "# TYPE office_booking_log_records_dropped_total counter",
+            f"office_booking_log_records_dropped_total {dropped_records()}",
+        ]
+        lines += render_admission(admission.stats())
+        return "\n".join(lines) + "\n"
+
+
+def render_admission(stats: dict):
+    classes = stats["classes"]
+    lines = [
+        "# HELP office_booking_admission_active Requests past the admission gate by route class.",
+        "# TYPE office_booking_admission_active gauge",
+    ]
+    lines += [f'office_booking_admission_active{{class="{name}"}} {gate["active"]}' for name, gate in classes.items()]
+    lines += [
+        "# HELP office_booking_admission_queued Requests waiting at the admission gate by route class.",
+        "# TYPE office_booking_admission_queued gauge",
+    ]
+    lines += [f'office_booking_admission_queued{{class="{name}"}} {gate["queued"]}' for name, gate in classes.items()]
+    lines += [
+        "# HELP office_booking_admission_shed_total Requests rejected with 503 by route class and reason.",
+        "# TYPE office_booking_admission_shed_total counter",
+    ]
+    lines += [f'office_booking_admission_shed_total{{class="{name}",reason="{reason}"}} {count}'
+              for name, gate in classes.items() for reason, count in gate["shed"].items()]
+    lines += [
+        "# HELP office_booking_rate_limited_total Requests rejected with 429 by the per-user rate limit.",
+        "# TYPE office_booking_rate_limited_total counter",
+        f"office_booking_rate_limited_total {stats['rate_limited']}",
+    ]
+    return lines
+
+
+def render_histograms(name: str, description: str, histograms: Dict[str, Histogram]):
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    for labels, histogram in histograms.items():
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ("+Inf",), histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+    return lines
+
+
+metrics = Metrics()
+
+
+class MetricsMiddleware:
+    """Times every HTTP request and labels it with the matched route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.in_flight -= 1
+            current_request.reset(token)
+            route = scope.get("route")
+            metrics.record(scope["method"], getattr(route, "path", "unmatched"), status, elapsed, stats)
+
+
+def timed(section: str):
+    """Add the wrapped function's run time to the current request's section."""
+
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    stats = current_request.get()
+                    if stats is not None:
+                        stats.add_section(section, time.perf_counter() - started)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stats = current_request.get()
+                if stats is not None:
+                    stats.add_section(section, time.perf_counter() - started)
+        return wrapper
+
+    return decorator
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"]
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += elapsed
+        # Page totals from fastapi-pagination and paginate_keyset.
+        if statement.startswith("SELECT count("):
+            stats.add_section("pagination_count", elapsed)
+
+
+def instrument(engine):
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
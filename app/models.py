@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -29,7 +29,12 @@ class Room(Base):
     capacity = Column(Integer)
     office_id = Column(Integer, ForeignKey("offices.id", ondelete="CASCADE"))
     office = relationship("Office", back_populates="rooms", single_parent=True)
-    bookings = relationship("Booking", back_populates="room", single_parent=True)
+    # Deleting a room leaves its bookings to the ON DELETE CASCADE foreign key.
+    bookings = relationship("Booking", back_populates="room", single_parent=True, passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_rooms_office_id_capacity", "office_id", "capacity"),
+    )
 
 
 class Booking(Base):
@@ -40,5 +45,36 @@ class Booking(Base):
     end_time = Column(DateTime, nullable=False)
     room_id = Column(Integer, ForeignKey("rooms.id", ondelete="CASCADE"))
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    series_id = Column(String, index=True, nullable=True)
+    recurrence = Column(String, nullable=True)
     room = relationship("Room", back_populates="bookings", single_parent=True)
     user = relationship("User", back_populates="bookings", single_parent=True)
+
+    __table_args__ = (
+        Index("ix_bookings_room_id_start_time_end_time", "room_id", "start_time", "end_time"),
+        Index("ix_bookings_user_id_start_time", "user_id", "start_time"),
+        # Never hand out an id again once its row is deleted or moved to bookings_archive.
+        {"sqlite_autoincrement": True},
+    )
+
+
+class ArchivedBooking(Base):
+    """Bookings moved out of `bookings` by app.archive once they are far enough in the past.
+
+    Columns match `bookings` one for one (ids are kept) so both tables can
+    be read as one with UNION ALL.
+    """
+    __tablename__ = "bookings_archive"
+
+    id = Column(Integer, primary_key=True)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    room_id = Column(Integer, ForeignKey("rooms.id", ondelete="CASCADE"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    series_id = Column(String, nullable=True)
+    recurrence = Column(String, nullable=True)
+
+    __table_args__ = (
+        Index("ix_bookings_archive_room_id_start_time", "room_id", "start_time"),
+        Index("ix_bookings_archive_user_id_start_time", "user_id", "start_time"),
+    )
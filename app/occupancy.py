@@ -0,0 +1,158 @@
+import base64
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.archive import booking_source
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+WEEK_SLOTS = 7 * SLOTS_PER_DAY
+WEEK = timedelta(days=7)
+SLOT = timedelta(minutes=SLOT_MINUTES)
+# bytes.translate tables, so a booking updates its whole run of slots in one C call.
+INCREMENT = bytes(min(count + 1, 255) for count in range(256))
+DECREMENT = bytes(max(count - 1, 0) for count in range(256))
+OCCUPIED_BITS = b"0" + b"1" * 255
+
+
+def week_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, value.day) - timedelta(days=value.weekday())
+
+
+def slot_range(week: datetime, start_time: datetime, end_time: datetime) -> Tuple[int, int]:
+    """Slots of week that [start_time, end_time) touches, clipped to the week."""
+    first = (start_time - week) // SLOT
+    last = -((week - end_time) // SLOT)
+    return (first if first > 0 else 0), (last if last < WEEK_SLOTS else WEEK_SLOTS)
+
+
+def day_bitmaps(counts: bytes) -> List[str]:
+    """One base64 bitmap per day, most significant bit of the first byte for 00:00-00:15."""
+    bits = counts.translate(OCCUPIED_BITS)
+    return [
+        base64.b64encode(int(bits[day:day + SLOTS_PER_DAY], 2).to_bytes(SLOTS_PER_DAY // 8, "big")).decode()
+        for day in range(0, WEEK_SLOTS, SLOTS_PER_DAY)
+    ]
+
+
+class OccupancyStore:
+    """Bookings per 15-minute slot of each cached room and week, one byte per slot.
+
+    Counts rather than bits, so removing a booking frees a slot only when no
+    other booking still touches it. Weeks are loaded from the database on
+    first use and kept in step by the booking write handlers, which commit
+    and apply their changes inside `writing`; a week loaded while a write to
+    its room was in flight is used for that request but not stored. Writes
+    from other processes are not seen here, so a stored week is reloaded
+    once it is ttl seconds old.
+    """
+
+    def __init__(self, maxsize: int = 20000, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._weeks: "OrderedDict[Tuple[int, datetime], Tuple[float, bytearray]]" = OrderedDict()
+        self._generations: Dict[int, int] = {}
+        self._writers: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._weeks.clear()
+
+    @contextmanager
+    def writing(self, *room_ids):
+        """Wrap a booking write from before its commit until add/remove have run.
+
+        A week loaded in between already sees the commit, and storing it would
+        count the booking twice once add runs.
+        """
+        room_ids = [room_id for room_id in room_ids if room_id is not None]
+        with self._lock:
+            for room_id in room_ids:
+                self._generations[room_id] = self._generations.get(room_id, 0) + 1
+                self._writers[room_id] = self._writers.get(room_id, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                for room_id in room_ids:
+                    if self._writers[room_id] == 1:
+                        del self._writers[room_id]
+                    else:
+                        self._writers[room_id] -= 1
+
+    def _apply(self, room_id: int, start_time: datetime, end_time: datetime, table: bytes):
+        with self._lock:
+            self._generations[room_id] = self._generations.get(room_id, 0) + 1
+            week = week_start(start_time)
+            while week < end_time:
+                cached = self._weeks.get((room_id, week))
+                if cached is not None:
+                    counts = cached[1]
+                    first, last = slot_range(week, start_time, end_time)
+                    counts[first:last] = counts[first:last].translate(table)
+                week += WEEK
+
+    def add(self, room_id: int, start_time: datetime, end_time: datetime):
+        self._apply(room_id, start_time, end_time, INCREMENT)
+
+    def remove(self, room_id: int, start_time: datetime, end_time: datetime):
+        self._apply(room_id, start_time, end_time, DECREMENT)
+
+    def discard_rooms(self, room_ids: Iterable[int]):
+        room_ids = set(room_ids)
+        with self._lock:
+            for room_id in room_ids:
+                self._generations[room_id] = self._generations.get(room_id, 0) + 1
+            for key in [key for key in self._weeks if key[0] in room_ids]:
+                del self._weeks[key]
+
+    def week(self, db: Session, room_ids: List[int], week: datetime, now: Optional[float] = None) -> Dict[int, bytes]:
+        """Slot counts of week for every room in room_ids, loading the rooms not cached (or expired) in one query."""
+        now = time.monotonic() if now is None else now
+        counts, missing = {}, []
+        with self._lock:
+            for room_id in room_ids:
+                cached = self._weeks.get((room_id, week))
+                if cached is None or cached[0] <= now:
+                    missing.append(room_id)
+                else:
+                    self._weeks.move_to_end((room_id, week))
+                    counts[room_id] = bytes(cached[1])
+            generations = {room_id: self._generations.get(room_id, 0) for room_id in missing}
+        if not missing:
+            return counts
+
+        loaded = {room_id: bytearray(WEEK_SLOTS) for room_id in missing}
+        source = booking_source(week)
+        rows = db.execute(select(source.room_id, source.start_time, source.end_time).where(
+            source.room_id.in_(missing),
+            source.start_time < week + WEEK,
+            source.end_time > week
+        ))
+        for room_id, start_time, end_time in rows:
+            first, last = slot_range(week, start_time, end_time)
+            room_counts = loaded[room_id]
+            room_counts[first:last] = room_counts[first:last].translate(INCREMENT)
+
+        with self._lock:
+            for room_id, room_counts in loaded.items():
+                if self._generations.get(room_id, 0) == generations[room_id] and room_id not in self._writers:
+                    self._weeks[(room_id, week)] = (now + self.ttl, room_counts)
+                    self._weeks.move_to_end((room_id, week))
+            while len(self._weeks) > self.maxsize:
+                self._weeks.popitem(last=False)
+        counts.update((room_id, bytes(room_counts)) for room_id, room_counts in loaded.items())
+        return counts
+
+
+occupancy_store = OccupancyStore(int(os.getenv("CALENDAR_CACHE_SIZE", "20000")),
+                                 float(os.getenv("CALENDAR_CACHE_TTL_SECONDS", "5")))
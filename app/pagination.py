@@ -0,0 +1,106 @@
+import base64
+import json
+from datetime import datetime
+from math import ceil
+from typing import Generic, List, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from fastapi_pagination import Params
+from fastapi_pagination.api import resolve_params
+from pydantic import BaseModel
+from sqlalchemy import DateTime, and_, or_
+
+T = TypeVar("T")
+TWO_DIGITS = tuple(f"{i:02d}" for i in range(100))
+# Same output as JSONResponse, with one encoder built up front instead of one per response.
+json_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+def encode_cursor(values: Sequence) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        if not all(isinstance(value, (str, int, float)) for value in values):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+            for column, value in zip(columns, values)
+        ]
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def after(columns: Sequence, values: Sequence):
+    # (a, b) > (x, y) written as a >= x AND (a > x OR b > y) so the leading
+    # column stays usable for an index range scan.
+    if len(columns) == 1:
+        return columns[0] > values[0]
+    first, rest = columns[0], columns[1:]
+    return and_(first >= values[0], or_(first > values[0], after(rest, values[1:])))
+
+
+def paginate_keyset(query, columns: Sequence, cursor: Optional[str], size: int, include_total: bool = True):
+    total = query.order_by(None).count() if include_total else None
+    if cursor:
+        query = query.filter(after(columns, decode_cursor(cursor, columns)))
+    rows = query.order_by(*columns).limit(size + 1).all()
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+    return {"items": rows, "next_cursor": next_cursor, "total": total}
+
+
+def format_datetime(value: datetime) -> str:
+    """value.strftime('%d-%m-%Y %H:%M') without going through strftime."""
+    return (f"{TWO_DIGITS[value.day]}-{TWO_DIGITS[value.month]}-{value.year} "
+            f"{TWO_DIGITS[value.hour]}:{TWO_DIGITS[value.minute]}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse for content that is already plain JSON types."""
+
+    def render(self, content) -> bytes:
+        return json_encoder.encode(content).encode("utf-8")
+
+
+def schema_columns(model, schema):
+    """model's columns in the order of schema's fields, the order its JSON lists them in."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def paginate_rows(query, schema, params: Optional[Params] = None) -> FastJSONResponse:
+    """Page[schema] for a query over schema_columns(...), built from the row tuples.
+
+    Skips validating every row into schema and dumping it again; the bytes
+    are the same as the Page[schema] response model would produce.
+    """
+    params = resolve_params(params)
+    total = query.order_by(None).count()
+    rows = query.limit(params.size).offset(params.size * (params.page - 1)).all()
+
+    names = list(schema.model_fields)
+    datetimes = [name for name, column in zip(names, query.column_descriptions)
+                 if isinstance(column["type"], DateTime)]
+    items = [dict(zip(names, row)) for row in rows]
+    for item in items:
+        for name in datetimes:
+            if item[name] is not None:
+                item[name] = format_datetime(item[name])
+    return FastJSONResponse({"items": items, "total": total, "page": params.page, "size": params.size,
+                             "pages": ceil(total / params.size)})
@@ -0,0 +1,118 @@
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+# "off", "header" (profile requests sending X-SQL-Profile: 1) or "all".
+SQL_PROFILE = os.getenv("SQL_PROFILE", "off")
+SLOW_QUERY_SECONDS = float(os.getenv("SQL_SLOW_QUERY_MS", "100")) / 1000
+# Statement shapes run at least this often in one request are flagged as N+1.
+REPEAT_THRESHOLD = int(os.getenv("SQL_PROFILE_REPEAT_THRESHOLD", "3"))
+PROFILE_HEADER = "x-sql-profile"
+
+slow_query_logger = logging.getLogger("office_booking.slow_sql")
+
+
+class RequestProfile:
+    """Statements one request ran, with their durations."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.statements: List[Tuple[str, float]] = []
+
+    def repeated(self) -> List[Tuple[str, int]]:
+        shapes = Counter(statement for statement, _ in self.statements)
+        return [(statement, count) for statement, count in shapes.most_common() if count >= REPEAT_THRESHOLD]
+
+    def summary(self) -> str:
+        total = sum(seconds for _, seconds in self.statements)
+        slowest = max((seconds for _, seconds in self.statements), default=0.0)
+        slow = sum(1 for _, seconds in self.statements if seconds >= SLOW_QUERY_SECONDS)
+        parts = [f"queries={len(self.statements)}", f"total_ms={total * 1000:.2f}",
+                 f"slowest_ms={slowest * 1000:.2f}", f"slow={slow}"]
+        repeated = self.repeated()
+        if repeated:
+            statement, count = repeated[0]
+            parts.append(f"repeated={len(repeated)}")
+            parts.append(f'top_repeated="{count}x {" ".join(statement.split())[:120]}"')
+        return "; ".join(parts)
+
+
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+def wants_profile(scope) -> bool:
+    if SQL_PROFILE == "all":
+        return True
+    if SQL_PROFILE != "header":
+        return False
+    return any(name == PROFILE_HEADER.encode() and value in (b"1", b"true") for name, value in scope["headers"])
+
+
+class ProfileMiddleware:
+    """Profiles the SQL of selected requests and reports it in an X-SQL-Profile header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(f'{scope["method"]} {scope["path"]}')
+
+        async def send_with_summary(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_HEADER.encode(), profile.summary().encode("latin-1", "replace")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        token = current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_summary)
+        finally:
+            current_profile.reset(token)
+            for statement, count in profile.repeated():
+                slow_query_logger.warning("Statement ran %d times in %s (possible N+1): %s",
+                                          count, profile.label, " ".join(statement.split()))
+
+
+def query_plan(conn, statement: str, parameters) -> str:
+    if conn.dialect.name != "sqlite":
+        return ""
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return "; ".join(row[-1] for row in cursor.fetchall())
+    except Exception as exc:
+        return f"unavailable ({exc})"
+    finally:
+        cursor.close()
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_profile.get() is not None:
+        conn.info["profile_started"] = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    if profile is None:
+        return
+    elapsed = time.perf_counter() - conn.info["profile_started"]
+    profile.statements.append((statement, elapsed))
+    if elapsed >= SLOW_QUERY_SECONDS:
+        plan = "executemany" if executemany else query_plan(conn, statement, parameters)
+        slow_query_logger.warning("Slow query (%.1f ms) in %s: %s | params=%.500r | plan: %s",
+                                  elapsed * 1000, profile.label, " ".join(statement.split()), parameters, plan)
+
+
+def instrument(engine):
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
@@ -0,0 +1,103 @@
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+class ReadCache:
+    """Bounded LRU of serialized read responses, grouped by namespace.
+
+    Every write to a namespace bumps its generation and drops its entries.
+    A response built while a write was in flight is not stored, so a slow
+    reader can never put stale data back after the invalidation. Writes made
+    by other processes are not seen here, so entries also expire after ttl
+    seconds, unless ttls gives their namespace its own (None never expires).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 5.0, ttls: Optional[Dict[str, Optional[float]]] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self._entries: "OrderedDict[tuple, Tuple[float, Tuple[str, bytes]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def get(self, namespace: str, key, now: Optional[float] = None) -> Optional[Tuple[str, bytes]]:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            cached = self._entries.get((namespace, key))
+            if cached is None:
+                return None
+            expires, entry = cached
+            if expires <= now:
+                del self._entries[(namespace, key)]
+                return None
+            self._entries.move_to_end((namespace, key))
+            return entry
+
+    def put(self, namespace: str, key, generation: int, entry: Tuple[str, bytes], now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.generation(namespace) != generation:
+                return
+            ttl = self.ttls.get(namespace, self.ttl)
+            self._entries[(namespace, key)] = (math.inf if ttl is None else now + ttl, entry)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *namespaces: str):
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] = self.generation(namespace) + 1
+            self._entries = OrderedDict(
+                (key, entry) for key, entry in self._entries.items() if key[0] not in namespaces
+            )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Utilization reports cover closed periods only and are invalidated by any write in the past.
+read_cache = ReadCache(int(os.getenv("READ_CACHE_SIZE", "1024")), float(os.getenv("READ_CACHE_TTL_SECONDS", "5")),
+                       ttls={"utilization": None})
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def cached_response(request: Request, namespace: str, build: Callable[[], object]) -> Response:
+    """Serve build()'s JSON from the cache, or a 304 when the client already has it.
+
+    The key is the path plus the sorted query string, so pages and filters
+    are cached separately. build() runs only on a miss.
+    """
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+    entry = read_cache.get(namespace, key)
+    if entry is None:
+        generation = read_cache.generation(namespace)
+        content = build()
+        # Endpoints with a serialization fast path hand back a finished response.
+        body = content.body if isinstance(content, Response) else JSONResponse(jsonable_encoder(content)).body
+        entry = (f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"', body)
+        read_cache.put(namespace, key, generation, entry)
+    etag, body = entry
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
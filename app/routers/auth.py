@@ -1,53 +1,109 @@
 import os
 from datetime import timedelta
+from uuid import uuid4
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from app.utils import create_access_token, verify_password, get_password_hash, verify_token
-from app.database import get_db
+from app.utils import create_access_token, verify_token
+from app.hashing import hashing_pool
+from app.database import get_db, get_async_db, run_db
 from app.models import User
 from app.schemas import Token, UserCreate, User as UserSchema
+from app.token_cache import token_cache, token_denylist
+from app.metrics import timed
+from app.log_pipeline import set_user
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES'))
+# Build the current user from the token claims instead of loading it.
+AUTH_STATELESS = os.getenv("AUTH_STATELESS", "false").lower() == "true"
 
 
 def get_user(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = get_user(db, email)
-    if not user or not verify_password(password, user.hashed_password):
+def get_credentials(db: Session, email: str):
+    try:
+        return db.query(User.id, User.email, User.hashed_password).filter(User.email == email).first()
+    finally:
+        # Hand the connection back to the pool instead of holding it while hashing.
+        db.close()
+
+
+async def authenticate_user(db: Session, email: str, password: str):
+    user = await run_db(db, get_credentials, email)
+    if not user or not await hashing_pool.verify(password, user.hashed_password):
         return False
     return user
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def add_user(db: Session, email: str, hashed_password: str):
+    db_user = User(email=email, hashed_password=hashed_password)
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
+
+def verify_payload(token: str):
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = verify_token(token)
+        if payload is None:
+            return None
+        token_cache.put(token, payload)
+    if token_denylist.is_revoked(payload):
+        return None
+    return payload
+
+
+def load_user(db: Session, payload: dict):
+    if payload.get("uid") is None:
+        return get_user(db, email=payload["sub"])
+    return db.get(User, payload["uid"])
+
+
+def credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    payload = verify_token(token)
-    if payload is None:
-        raise credentials_exception
-    email: str = payload.get("sub")
-    if email is None:
-        raise credentials_exception
-    user = get_user(db, email=email)
+
+
+@timed("get_current_user")
+async def resolve_user(token: str, db):
+    payload = verify_payload(token)
+    if payload is None or payload.get("sub") is None:
+        raise credentials_exception()
+    if AUTH_STATELESS and payload.get("uid") is not None:
+        set_user(payload["uid"])
+        return User(id=payload["uid"], email=payload["sub"])
+    # Keep the lookup off the event loop: a blocked loop cannot hand pooled
+    # connections back, which stalls every request under load.
+    user = await run_db(db, load_user, payload)
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
+    set_user(user.id)
     return user
 
 
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    return await resolve_user(token, db)
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db=Depends(get_async_db)):
+    return await resolve_user(token, db)
+
+
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
         form_data: OAuth2PasswordRequestForm = Depends(),
         db: Session = Depends(get_db)
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,22 +112,32 @@ async def login_for_access_token(
         )
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "uid": user.id, "ver": token_denylist.version(user.id), "jti": uuid4().hex},
+        expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 
+@router.post("/logout")
+def logout(token: str = Depends(oauth2_scheme), current_user: User = Depends(get_current_user)):
+    token_denylist.revoke(verify_payload(token))
+    token_cache.discard(token)
+    return {"message": "Token revoked"}
+
+
+@router.post("/logout/all")
+def logout_all(current_user: User = Depends(get_current_user)):
+    token_denylist.revoke_user(current_user.id)
+    return {"message": "All tokens revoked"}
+
+
 @router.post("/register", response_model=UserSchema)
 async def register_user(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = get_user(db, email=user.email)
+    db_user = await run_db(db, get_credentials, user.email)
     if db_user:
         raise HTTPException(
             status_code=400,
             detail="Email already registered"
         )
-    hashed_password = get_password_hash(user.password)
-    db_user = User(email=user.email, hashed_password=hashed_password)
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    hashed_password = await hashing_pool.hash(user.password)
+    return await run_db(db, add_user, user.email, hashed_password)
@@ -0,0 +1,254 @@
+import heapq
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session
+from app.archive import booking_source
+from app.database import get_db
+from app.models import Booking, Office, Room, User
+from app.occupancy import SLOT_MINUTES, day_bitmaps, occupancy_store, week_start
+from app.pagination import FastJSONResponse, format_datetime
+from app.read_cache import cached_response, read_cache
+from app.schemas import Room as RoomSchema, AvailableSlot, OfficeCalendar, OfficeUtilization
+from app.routers.auth import get_current_user
+from app.utils import end_time_must_be_after_start_time, parse_datetime
+
+router = APIRouter()
+
+
+def parse_window(start: str, end: str):
+    try:
+        start_time, end_time = parse_datetime(start), parse_datetime(end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if end_time_must_be_after_start_time(start_time=start_time, end_time=end_time):
+        raise HTTPException(status_code=400, detail="end must be after start")
+    return start_time, end_time
+
+
+def available_rooms_query(db: Session, office_id: int, start_time: datetime, end_time: datetime,
+                          min_capacity: Optional[int] = None):
+    booked = exists().where(
+        Booking.room_id == Room.id,
+        Booking.start_time < end_time,
+        Booking.end_time > start_time
+    )
+    query = db.query(Room).filter(Room.office_id == office_id, ~booked)
+    if min_capacity:
+        query = query.filter(Room.capacity >= min_capacity)
+    return query.order_by(Room.capacity, Room.id)
+
+
+@router.get("/offices/{office_id}/available-rooms", response_model=List[RoomSchema])
+def read_available_rooms(
+        office_id: int,
+        start: str = Query(..., description="Window start DD-MM-YYYY HH:MM"),
+        end: str = Query(..., description="Window end DD-MM-YYYY HH:MM"),
+        min_capacity: Optional[int] = Query(None, description="Minimum room capacity"),
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+):
+    start_time, end_time = parse_window(start, end)
+    rooms = available_rooms_query(db, office_id, start_time, end_time, min_capacity).all()
+    if not rooms and db.query(Office.id).filter(Office.id == office_id).first() is None:
+        raise HTTPException(status_code=404, detail="Office not found")
+    return rooms
+
+
+def parse_time_of_day(value: str) -> time:
+    try:
+        return datetime.strptime(value, '%H:%M').time()
+    except ValueError:
+        raise HTTPException(status_code=400, detail='Invalid time format. Please use HH:MM')
+
+
+def round_up(value: datetime, step: timedelta) -> datetime:
+    remainder = (value - datetime.combine(value.date(), time())) % step
+    return value + (step - remainder) if remainder else value
+
+
+def earliest_fit(free_start: datetime, free_end: datetime, duration: timedelta, step: timedelta,
+                 day_start: time, day_end: time) -> Optional[datetime]:
+    day = free_start.date()
+    while datetime.combine(day, day_start) < free_end:
+        window_start = max(free_start, datetime.combine(day, day_start))
+        window_end = min(free_end, datetime.combine(day, day_end))
+        slot_start = round_up(window_start, step)
+        if slot_start + duration <= window_end:
+            return slot_start
+        day += timedelta(days=1)
+    return None
+
+
+@router.get("/offices/{office_id}/next-slot", response_model=List[AvailableSlot])
+def read_next_slot(
+        office_id: int,
+        duration: int = Query(60, ge=5, le=24 * 60, description="Slot length in minutes"),
+        min_capacity: Optional[int] = Query(None, description="Minimum room capacity"),
+        start: Optional[str] = Query(None, description="Search from DD-MM-YYYY HH:MM, defaults to now"),
+        days: int = Query(14, ge=1, le=62, description="Search horizon in days"),
+        day_start: str = Query("09:00", description="Working hours start HH:MM"),
+        day_end: str = Query("18:00", description="Working hours end HH:MM"),
+        limit: int = Query(5, ge=1, le=100, description="Number of candidates to return"),
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+):
+    step = timedelta(minutes=15)
+    length = timedelta(minutes=duration)
+    opens, closes = parse_time_of_day(day_start), parse_time_of_day(day_end)
+    if closes <= opens:
+        raise HTTPException(status_code=400, detail="day_end must be after day_start")
+    try:
+        horizon_start = parse_datetime(start) if start else datetime.utcnow()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    horizon_start = round_up(horizon_start.replace(second=0, microsecond=0), step)
+    horizon_end = horizon_start + timedelta(days=days)
+
+    rooms_query = db.query(Room).filter(Room.office_id == office_id)
+    if min_capacity:
+        rooms_query = rooms_query.filter(Room.capacity >= min_capacity)
+    rooms = rooms_query.all()
+    if not rooms:
+        if db.query(Office.id).filter(Office.id == office_id).first() is None:
+            raise HTTPException(status_code=404, detail="Office not found")
+        return []
+
+    # One query returns every relevant booking of every candidate room in
+    # (room, start) order; each room's free gaps are then found in one pass.
+    busy = defaultdict(list)
+    rows = db.query(Booking.room_id, Booking.start_time, Booking.end_time).filter(
+        Booking.room_id.in_([room.id for room in rooms]),
+        Booking.start_time < horizon_end,
+        Booking.end_time > horizon_start
+    ).order_by(Booking.room_id, Booking.start_time)
+    for room_id, start_time, end_time in rows:
+        busy[room_id].append((start_time, end_time))
+
+    candidates = []
+    for room in rooms:
+        cursor = horizon_start
+        found = None
+        for start_time, end_time in busy[room.id] + [(horizon_end, horizon_end)]:
+            if start_time > cursor:
+                found = earliest_fit(cursor, start_time, length, step, opens, closes)
+                if found is not None:
+                    break
+            cursor = max(cursor, end_time)
+        if found is not None:
+            fit = (room.capacity or 0) - (min_capacity or 0)
+            candidates.append((found, fit, room.id, room))
+
+    return [
+        {"start_time": found, "end_time": found + length, "room": room}
+        for found, _, _, room in heapq.nsmallest(limit, candidates, key=lambda candidate: candidate[:3])
+    ]
+
+
+# A Monday, so minutes since it map straight onto weekday/hour-of-day cells.
+WEEK_EPOCH = datetime(2001, 1, 1)
+MINUTE = timedelta(minutes=1)
+
+
+def add_minutes(cells: List[int], start_time: datetime, end_time: datetime):
+    """Spread [start_time, end_time) over 7 x 24 weekday/hour-of-day cells, Monday 00:00 first."""
+    start, end = (start_time - WEEK_EPOCH) // MINUTE, (end_time - WEEK_EPOCH) // MINUTE
+    while start < end:
+        hour_end = min(start - start % 60 + 60, end)
+        cells[start // 60 % 168] += hour_end - start
+        start = hour_end
+
+
+def percent(booked: float, available: float) -> float:
+    return round(100 * booked / available, 2) if available else 0.0
+
+
+def occupancy(booked: List[int], available: List[int], rooms: int = 1) -> dict:
+    hours = [(sum(booked[hour::24]), sum(available[hour::24]) * rooms) for hour in range(24)]
+    weekdays = [(sum(booked[day * 24:day * 24 + 24]), sum(available[day * 24:day * 24 + 24]) * rooms)
+                for day in range(7)]
+    return {
+        "booked_minutes": sum(booked),
+        "occupancy": percent(sum(booked), sum(available) * rooms),
+        "by_hour": [percent(*cell) for cell in hours],
+        "by_weekday": [percent(*cell) for cell in weekdays],
+    }
+
+
+def invalidate_utilization(*start_times: datetime):
+    # Only closed periods are cached, so bookings starting in the future cannot touch them.
+    now = datetime.utcnow()
+    if any(start_time < now for start_time in start_times):
+        read_cache.invalidate("utilization")
+
+
+@router.get("/offices/{office_id}/utilization", response_model=OfficeUtilization)
+def read_utilization(
+        office_id: int,
+        request: Request,
+        start: str = Query(..., description="Range start DD-MM-YYYY HH:MM"),
+        end: str = Query(..., description="Range end DD-MM-YYYY HH:MM"),
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+):
+    start_time, end_time = parse_window(start, end)
+
+    def build():
+        rooms = db.query(Room.id, Room.name).filter(Room.office_id == office_id).order_by(Room.id).all()
+        if not rooms and db.query(Office.id).filter(Office.id == office_id).first() is None:
+            raise HTTPException(status_code=404, detail="Office not found")
+
+        # Bookings of every room come back in one query and are clipped to the
+        # range; each then adds its minutes to its room's weekday/hour cells.
+        available = [0] * 168
+        add_minutes(available, start_time, end_time)
+        booked = {room_id: [0] * 168 for room_id, _ in rooms}
+        source = booking_source(start_time)
+        rows = db.execute(select(source.room_id, source.start_time, source.end_time).where(
+            source.room_id.in_(booked),
+            source.start_time < end_time,
+            source.end_time > start_time
+        ))
+        for room_id, booking_start, booking_end in rows:
+            add_minutes(booked[room_id], max(booking_start, start_time), min(booking_end, end_time))
+
+        total = [sum(cells) for cells in zip(*booked.values())] if rooms else [0] * 168
+        return OfficeUtilization(
+            office_id=office_id, start_time=start_time, end_time=end_time,
+            **occupancy(total, available, len(rooms)),
+            rooms=[{"room_id": room_id, "name": name, **occupancy(booked[room_id], available)}
+                   for room_id, name in rooms],
+        )
+
+    if end_time <= datetime.utcnow():
+        return cached_response(request, "utilization", build)
+    return build()
+
+
+@router.get("/offices/{office_id}/calendar", response_model=OfficeCalendar)
+def read_calendar(
+        office_id: int,
+        week: Optional[str] = Query(None, description="Any day of the week DD-MM-YYYY, defaults to this week"),
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+):
+    try:
+        day = datetime.strptime(week, '%d-%m-%Y') if week else datetime.utcnow()
+    except ValueError:
+        raise HTTPException(status_code=400, detail='Invalid week format. Please use DD-MM-YYYY')
+    start_time = week_start(day)
+
+    rooms = db.query(Room.id, Room.name).filter(Room.office_id == office_id).order_by(Room.id).all()
+    if not rooms and db.query(Office.id).filter(Office.id == office_id).first() is None:
+        raise HTTPException(status_code=404, detail="Office not found")
+    # Occupancy of every room comes from the slot store, so the grid is
+    # rendered from a few bytes per room rather than from booking rows.
+    counts = occupancy_store.week(db, [room_id for room_id, _ in rooms], start_time)
+    return FastJSONResponse({
+        "office_id": office_id,
+        "week_start": format_datetime(start_time),
+        "slot_minutes": SLOT_MINUTES,
+        "rooms": [{"room_id": room_id, "name": name, "days": day_bitmaps(counts[room_id])} for room_id, name in rooms],
+    })
@@ -1,43 +1,58 @@
-from typing import List, Optional
+import csv
+import io
+import json
+import os
+from typing import List, Literal, Optional
+from uuid import uuid4
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from app.database import get_db
-from app.models import Booking, Room, User
-from app.schemas import BookingCreate, Booking as BookingSchema
+from sqlalchemy import insert, select
+from app.database import get_db, run_db
+from app.models import ArchivedBooking, Booking, Room, User
+from app.archive import archive_horizon, booking_source
+from app.booking_index import RoomIntervals, sweep_overlaps
+from app.booking_locks import booking_write
+from app.occupancy import occupancy_store
+from app.metrics import timed
+from app.schemas import (BookingCreate, Booking as BookingSchema, BookingBatchCreate, BookingBatchResult,
+                         RecurrenceRule, RecurringBookingResult)
 from app.routers.auth import get_current_user
-from datetime import datetime
-from app.utils import end_time_must_be_after_start_time
+from app.routers.availability import invalidate_utilization
+from datetime import datetime, timedelta
+from app.utils import end_time_must_be_after_start_time, parse_datetime
 from fastapi_pagination import Page
-from fastapi_pagination.ext.sqlalchemy import paginate
+from app.pagination import CursorPage, paginate_keyset, paginate_rows, schema_columns
 
 router = APIRouter()
+MAX_OCCURRENCES = 366
+RECURRENCE_ONLY_ON_SERIES = "recurrence is only accepted by /bookings/recurring"
+EXPORT_BATCH_SIZE = int(os.getenv("BOOKING_EXPORT_BATCH_SIZE", "1000"))
+EXPORT_COLUMNS = (Booking.id, Booking.room_id, Booking.user_id, Booking.start_time, Booking.end_time,
+                  Booking.series_id)
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
 
 
+@timed("check_booking_conflict")
 def check_booking_conflict(db: Session, room_id: int, start_time: datetime, end_time: datetime,
                            booking_id: Optional[int] = None):
-    query = db.query(Booking).filter(
+    return booking_conflict_query(db, room_id, start_time, end_time, booking_id).first() is not None
+
+
+def booking_conflict_query(db: Session, room_id: int, start_time: datetime, end_time: datetime,
+                           booking_id: Optional[int] = None):
+    # Two intervals overlap exactly when each starts before the other ends,
+    # which lets SQLite range-scan the (room_id, start_time, end_time) index.
+    query = db.query(Booking.id).filter(
         Booking.room_id == room_id,
-        or_(
-            and_(
-                Booking.start_time <= start_time,
-                Booking.end_time > start_time
-            ),
-            and_(
-                Booking.start_time < end_time,
-                Booking.end_time >= end_time
-            ),
-            and_(
-                Booking.start_time >= start_time,
-                Booking.end_time <= end_time
-            )
-        )
+        Booking.start_time < end_time,
+        Booking.end_time > start_time
     )
 
     if booking_id:
         query = query.filter(Booking.id != booking_id)
 
-    return query.first() is not None
+    return query
 
 
 @router.post("/bookings/", response_model=BookingSchema)
@@ -46,29 +61,220 @@ def create_booking(
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user)
 ):
+    if booking.recurrence is not None:
+        raise HTTPException(status_code=400, detail=RECURRENCE_ONLY_ON_SERIES)
+
     # Check if room exists
     room = db.query(Room).filter(Room.id == booking.room_id).first()
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
 
-    # Check for booking conflicts
-    if check_booking_conflict(db, booking.room_id, booking.start_time, booking.end_time):
-        raise HTTPException(status_code=400, detail="Room is already booked for this time period")
     if end_time_must_be_after_start_time(start_time=booking.start_time, end_time=booking.end_time):
         raise HTTPException(status_code=400, detail="end_time must be after start_time")
 
-    db_booking = Booking(**booking.dict(), user_id=current_user.id)
-    db.add(db_booking)
-    db.commit()
+    with occupancy_store.writing(booking.room_id), booking_write(db, booking.room_id):
+        # Check for booking conflicts
+        if check_booking_conflict(db, booking.room_id, booking.start_time, booking.end_time):
+            raise HTTPException(status_code=400, detail="Room is already booked for this time period")
+
+        db_booking = Booking(**booking.dict(exclude={"recurrence"}), user_id=current_user.id)
+        db.add(db_booking)
+        db.commit()
+        occupancy_store.add(db_booking.room_id, db_booking.start_time, db_booking.end_time)
+    invalidate_utilization(db_booking.start_time)
     db.refresh(db_booking)
     return db_booking
 
 
-def parse_datetime(value: str) -> datetime:
+@router.post("/bookings/batch", response_model=BookingBatchResult)
+def create_bookings_batch(
+        batch: BookingBatchCreate,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+):
+    items = batch.bookings
+    errors = {}
+    for index, booking in enumerate(items):
+        if booking.recurrence is not None:
+            errors[index] = RECURRENCE_ONLY_ON_SERIES
+        elif end_time_must_be_after_start_time(start_time=booking.start_time, end_time=booking.end_time):
+            errors[index] = "end_time must be after start_time"
+
+    room_ids = {booking.room_id for booking in items}
+    with occupancy_store.writing(*room_ids), booking_write(db, *room_ids):
+        return book_batch(db, batch, errors, room_ids, current_user)
+
+
+def book_batch(db: Session, batch: BookingBatchCreate, errors: dict, room_ids: set, current_user: User):
+    # One query for the rooms and one for every booking that could collide
+    # with the batch; everything else is checked in memory.
+    items = batch.bookings
+    rooms = {room_id: RoomIntervals() for room_id, in db.query(Room.id).filter(Room.id.in_(room_ids))}
+    existing = db.query(Booking.room_id, Booking.id, Booking.start_time, Booking.end_time).filter(
+        Booking.room_id.in_(rooms),
+        Booking.start_time < max(booking.end_time for booking in items),
+        Booking.end_time > min(booking.start_time for booking in items)
+    )
+    for room_id, booking_id, start_time, end_time in existing:
+        rooms[room_id].add(booking_id, start_time, end_time)
+
+    for index, booking in enumerate(items):
+        if index in errors:
+            continue
+        intervals = rooms.get(booking.room_id)
+        if intervals is None:
+            errors[index] = "Room not found"
+        elif intervals.overlaps(booking.start_time, booking.end_time):
+            errors[index] = "Room is already booked for this time period"
+        else:
+            # Negative ids keep accepted items apart from stored bookings.
+            intervals.add(-index - 1, booking.start_time, booking.end_time)
+
+    if errors and batch.mode == "all_or_nothing":
+        raise HTTPException(
+            status_code=400,
+            detail=[{"index": index, "error": error} for index, error in sorted(errors.items())]
+        )
+
+    accepted = [index for index in range(len(items)) if index not in errors]
+    created = {}
+    if accepted:
+        rows = [dict(items[index].dict(exclude={"recurrence"}), user_id=current_user.id) for index in accepted]
+        created = dict(zip(accepted, insert_bookings(db, rows)))
+        db.commit()
+        invalidate_utilization(*(booking.start_time for booking in created.values()))
+        for booking in created.values():
+            occupancy_store.add(booking.room_id, booking.start_time, booking.end_time)
+
+    return {
+        "created": len(created),
+        "results": [
+            {"index": index, "booking": created.get(index), "error": errors.get(index)}
+            for index in range(len(items))
+        ]
+    }
+
+
+def insert_bookings(db: Session, rows: List[dict]) -> List[BookingSchema]:
+    # Rows never share a room and start time (they would conflict), so that
+    # pair maps RETURNING rows back to their input without forcing SQLAlchemy
+    # into row-at-a-time inserts to preserve ordering.
+    booking_ids = {
+        (room_id, start_time): booking_id
+        for booking_id, room_id, start_time in db.execute(
+            insert(Booking).returning(Booking.id, Booking.room_id, Booking.start_time), rows
+        )
+    }
+    return [BookingSchema(id=booking_ids[row["room_id"], row["start_time"]], **row) for row in rows]
+
+
+def expand_occurrences(start_time: datetime, end_time: datetime, rule: RecurrenceRule):
+    step = 7 if rule.frequency == "weekly" else 1
+    if rule.until is not None:
+        span = (rule.until - start_time).days + 1
+    elif rule.frequency == "weekdays":
+        span = rule.count // 5 * 7 + 7
+    else:
+        span = rule.count * step
+    offsets = range(0, max(span, 0), step)
+    if rule.frequency == "weekdays":
+        weekday = start_time.weekday()
+        offsets = [day for day in offsets if (weekday + day) % 7 < 5]
+    offsets = offsets[:rule.count or MAX_OCCURRENCES + 1]
+    if len(offsets) > MAX_OCCURRENCES:
+        raise HTTPException(status_code=400,
+                            detail=f"Recurrence expands to more than {MAX_OCCURRENCES} occurrences")
+
+    duration = end_time - start_time
+    starts = [start_time + timedelta(days=day) for day in offsets]
+    ends = [start + duration for start in starts]
+    return starts, ends
+
+
+@router.post("/bookings/recurring", response_model=RecurringBookingResult)
+def create_recurring_booking(
+        booking: BookingCreate,
+        skip_conflicts: bool = Query(False, description="Book the free occurrences and skip the rest"),
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+):
+    rule = booking.recurrence
+    if rule is None:
+        raise HTTPException(status_code=400, detail="recurrence is required")
+    room = db.query(Room).filter(Room.id == booking.room_id).first()
+    if not room:
+        raise HTTPException(status_code=404, detail="Room not found")
+    if end_time_must_be_after_start_time(start_time=booking.start_time, end_time=booking.end_time):
+        raise HTTPException(status_code=400, detail="end_time must be after start_time")
+    if booking.end_time - booking.start_time > timedelta(days=7 if rule.frequency == "weekly" else 1):
+        raise HTTPException(status_code=400, detail="Booking is longer than the recurrence interval")
+
+    starts, ends = expand_occurrences(booking.start_time, booking.end_time, rule)
+    if not starts:
+        raise HTTPException(status_code=400, detail="Recurrence has no occurrences")
+
+    with occupancy_store.writing(booking.room_id), booking_write(db, booking.room_id):
+        # All occurrences are checked against the room's bookings in one query
+        # and a single merge pass over both sorted lists.
+        existing = db.query(Booking.start_time, Booking.end_time).filter(
+            Booking.room_id == booking.room_id,
+            Booking.start_time < ends[-1],
+            Booking.end_time > starts[0]
+        ).order_by(Booking.start_time).all()
+        conflicts = sweep_overlaps(starts, ends, [row[0] for row in existing], [row[1] for row in existing])
+        conflicting = [{"start_time": starts[i], "end_time": ends[i]} for i in conflicts]
+
+        if conflicts and not skip_conflicts:
+            raise HTTPException(status_code=400, detail={
+                "message": "Room is already booked for some occurrences",
+                "conflicts": [
+                    {key: value.strftime('%d-%m-%Y %H:%M') for key, value in occurrence.items()}
+                    for occurrence in conflicting
+                ]
+            })
+
+        series_id = uuid4().hex
+        skipped = set(conflicts)
+        rows = [
+            {"start_time": starts[i], "end_time": ends[i], "room_id": booking.room_id,
+             "user_id": current_user.id, "series_id": series_id, "recurrence": str(rule)}
+            for i in range(len(starts)) if i not in skipped
+        ]
+        created = insert_bookings(db, rows) if rows else []
+        db.commit()
+        invalidate_utilization(*(db_booking.start_time for db_booking in created))
+        for db_booking in created:
+            occupancy_store.add(db_booking.room_id, db_booking.start_time, db_booking.end_time)
+
+    return {"series_id": series_id if created else None, "created": created, "conflicts": conflicting}
+
+
+def filter_bookings(query, current_user: User, user_id: Optional[int] = None, room_id: Optional[int] = None,
+                    start_time: Optional[str] = None, end_time: Optional[str] = None, model=Booking):
+    # Apply filters
+    if room_id:
+        query = query.filter(model.room_id == room_id)
+    if user_id:
+        query = query.filter(model.user_id == user_id)
+    if start_time:
+        start_time_parsed = parse_filter_time(start_time)
+        query = query.filter(model.start_time >= start_time_parsed)
+    if end_time:
+        end_time_parsed = parse_filter_time(end_time)
+        query = query.filter(model.end_time <= end_time_parsed)
+
+    # Only show user's own bookings unless they're an admin
+    return query.filter(model.user_id == current_user.id)
+
+
+def parse_filter_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
     try:
-        return datetime.strptime(value, '%d-%m-%Y %H:%M')
-    except ValueError:
-        raise ValueError('Invalid datetime format. Please use DD-MM-YYYY HH:MM')
+        return parse_datetime(value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
 @router.get("/bookings/")
 def read_bookings(
@@ -79,24 +285,75 @@ def read_bookings(
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user)
 ) -> Page[BookingSchema]:
-    query = db.query(Booking)
+    source = booking_source(parse_filter_time(start_time))
+    query = filter_bookings(db.query(*schema_columns(source, BookingSchema)), current_user, user_id, room_id,
+                            start_time, end_time, source)
+    return paginate_rows(query, BookingSchema)
 
-    # Apply filters
-    if room_id:
-        query = query.filter(Booking.room_id == room_id)
-    if user_id:
-        query = query.filter(Booking.user_id == user_id)
-    if start_time:
-        start_time_parsed = parse_datetime(start_time)
-        query = query.filter(Booking.start_time >= start_time_parsed)
-    if end_time:
-        end_time_parsed = parse_datetime(end_time)
-        query = query.filter(Booking.end_time <= end_time_parsed)
 
-    # Only show user's own bookings unless they're an admin
-    query = query.filter(Booking.user_id == current_user.id)
+@router.get("/bookings/cursor", response_model=CursorPage[BookingSchema])
+def read_bookings_cursor(
+        user_id: Optional[int] = Query(None, description="Filter by user ID"),
+        room_id: Optional[int] = Query(None, description="Filter by room ID"),
+        start_time: Optional[str] = Query(None, description="Filter by start time DD-MM-YYYY HH:MM"),
+        end_time: Optional[str] = Query(None, description="Filter by end time DD-MM-YYYY HH:MM"),
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+        size: int = Query(50, ge=1, le=100, description="Page size"),
+        include_total: bool = Query(True, description="Count all matching bookings"),
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+):
+    source = booking_source(parse_filter_time(start_time))
+    query = filter_bookings(db.query(source), current_user, user_id, room_id, start_time, end_time, source)
+    return paginate_keyset(query, [source.start_time, source.id], cursor, size, include_total)
+
+
+def encode_export_rows(rows, format: str) -> bytes:
+    # Rows are written straight from the result tuples, in the field names
+    # and datetime format of the Booking schema.
+    names = [column.key for column in EXPORT_COLUMNS]
+    rows = [[value.strftime('%d-%m-%Y %H:%M') if isinstance(value, datetime) else value for value in row]
+            for row in rows]
+    if format == "ndjson":
+        return "".join(json.dumps(dict(zip(names, row))) + "\n" for row in rows).encode()
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+@router.get("/bookings/export")
+async def export_bookings(
+        format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson or csv"),
+        user_id: Optional[int] = Query(None, description="Filter by user ID"),
+        room_id: Optional[int] = Query(None, description="Filter by room ID"),
+        start_time: Optional[str] = Query(None, description="Filter by start time DD-MM-YYYY HH:MM"),
+        end_time: Optional[str] = Query(None, description="Filter by end time DD-MM-YYYY HH:MM"),
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+):
+    source = booking_source(parse_filter_time(start_time))
+    statement = filter_bookings(select(*(getattr(source, column.key) for column in EXPORT_COLUMNS)), current_user,
+                                user_id, room_id, start_time, end_time, source) \
+        .order_by(source.start_time, source.id)
+
+    async def body():
+        # The session dependency has already exited once streaming starts,
+        # so the stream owns the session and closes it when done.
+        try:
+            partitions = await run_db(db, lambda session: session.execute(
+                statement, execution_options={"yield_per": EXPORT_BATCH_SIZE}).partitions())
+            if format == "csv":
+                yield encode_export_rows([[column.key for column in EXPORT_COLUMNS]], format)
+            while True:
+                rows = await run_db(db, lambda session: next(partitions, None))
+                if rows is None:
+                    break
+                yield encode_export_rows(rows, format)
+        finally:
+            await run_db(db, lambda session: session.close())
 
-    return paginate(query)
+    return StreamingResponse(body(), media_type=EXPORT_MEDIA_TYPES[format],
+                             headers={"Content-Disposition": f'attachment; filename="bookings.{format}"'})
 
 
 @router.get("/bookings/{booking_id}", response_model=BookingSchema)
@@ -106,6 +363,8 @@ def read_booking(
         current_user: User = Depends(get_current_user)
 ):
     booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    if booking is None and archive_horizon() is not None:
+        booking = db.query(ArchivedBooking).filter(ArchivedBooking.id == booking_id).first()
     if booking is None:
         raise HTTPException(status_code=404, detail="Booking not found")
     if booking.user_id != current_user.id:
@@ -126,14 +385,26 @@ def update_booking(
     if db_booking.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to modify this booking")
 
-    # Check for booking conflicts
-    if check_booking_conflict(db, booking.room_id, booking.start_time, booking.end_time, booking_id):
-        raise HTTPException(status_code=400, detail="Room is already booked for this time period")
+    if booking.recurrence is not None:
+        raise HTTPException(status_code=400, detail=RECURRENCE_ONLY_ON_SERIES)
+
+    # Check if room exists
+    room = db.query(Room).filter(Room.id == booking.room_id).first()
+    if not room:
+        raise HTTPException(status_code=404, detail="Room not found")
 
-    for key, value in booking.dict().items():
-        setattr(db_booking, key, value)
+    old_room_id, old_start_time, old_end_time = db_booking.room_id, db_booking.start_time, db_booking.end_time
+    with occupancy_store.writing(old_room_id, booking.room_id), booking_write(db, old_room_id, booking.room_id):
+        # Check for booking conflicts
+        if check_booking_conflict(db, booking.room_id, booking.start_time, booking.end_time, booking_id):
+            raise HTTPException(status_code=400, detail="Room is already booked for this time period")
 
-    db.commit()
+        for key, value in booking.dict(exclude={"recurrence"}).items():
+            setattr(db_booking, key, value)
+        db.commit()
+        occupancy_store.remove(old_room_id, old_start_time, old_end_time)
+        occupancy_store.add(db_booking.room_id, db_booking.start_time, db_booking.end_time)
+    invalidate_utilization(old_start_time, db_booking.start_time)
     db.refresh(db_booking)
     return db_booking
 
@@ -150,6 +421,10 @@ def delete_booking(
     if db_booking.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this booking")
 
-    db.delete(db_booking)
-    db.commit()
+    room_id, start_time, end_time = db_booking.room_id, db_booking.start_time, db_booking.end_time
+    with occupancy_store.writing(room_id):
+        db.delete(db_booking)
+        db.commit()
+        occupancy_store.remove(room_id, start_time, end_time)
+    invalidate_utilization(start_time)
     return {"message": "Booking deleted successfully"}
@@ -1,12 +1,14 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import Office, User
 from app.schemas import OfficeCreate, Office as OfficeSchema
 from app.routers.auth import get_current_user
+from app.occupancy import occupancy_store
 from fastapi_pagination import Page
-from fastapi_pagination.ext.sqlalchemy import paginate
+from app.pagination import CursorPage, paginate_keyset, paginate_rows, schema_columns
+from app.read_cache import cached_response, read_cache
 
 router = APIRouter()
 
@@ -21,31 +23,55 @@ def create_office(
     db.add(db_office)
     db.commit()
     db.refresh(db_office)
+    read_cache.invalidate("offices")
     return db_office
 
 
 @router.get("/offices/")
 def read_offices(
+        request: Request,
         location: Optional[str] = Query(None, description="Filter by location"),
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user)
 ) -> Page[OfficeSchema]:
+    def build():
+        query = db.query(*schema_columns(Office, OfficeSchema))
+        if location:
+            query = query.filter(Office.location.ilike(f"%{location}%"))
+        return paginate_rows(query, OfficeSchema)
+
+    return cached_response(request, "offices", build)
+
+
+@router.get("/offices/cursor", response_model=CursorPage[OfficeSchema])
+def read_offices_cursor(
+        location: Optional[str] = Query(None, description="Filter by location"),
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+        size: int = Query(50, ge=1, le=100, description="Page size"),
+        include_total: bool = Query(True, description="Count all matching offices"),
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+):
     query = db.query(Office)
     if location:
         query = query.filter(Office.location.ilike(f"%{location}%"))
-    return paginate(query)
+    return paginate_keyset(query, [Office.id], cursor, size, include_total)
 
 
 @router.get("/offices/{office_id}", response_model=OfficeSchema)
 def read_office(
         office_id: int,
+        request: Request,
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user)
 ):
-    db_office = db.query(Office).filter(Office.id == office_id).first()
-    if db_office is None:
-        raise HTTPException(status_code=404, detail="Office not found")
-    return db_office
+    def build():
+        db_office = db.query(Office).filter(Office.id == office_id).first()
+        if db_office is None:
+            raise HTTPException(status_code=404, detail="Office not found")
+        return OfficeSchema.model_validate(db_office)
+
+    return cached_response(request, "offices", build)
 
 
 @router.put("/offices/{office_id}", response_model=OfficeSchema)
@@ -64,6 +90,7 @@ def update_office(
 
     db.commit()
     db.refresh(db_office)
+    read_cache.invalidate("offices")
     return db_office
 
 
@@ -77,6 +104,9 @@ def delete_office(
     if db_office is None:
         raise HTTPException(status_code=404, detail="Office not found")
 
+    room_ids = [room.id for room in db_office.rooms]
     db.delete(db_office)
     db.commit()
+    occupancy_store.discard_rooms(room_ids)
+    read_cache.invalidate("offices", "rooms", "utilization")
     return {"message": "Office deleted successfully"}
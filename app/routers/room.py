@@ -1,12 +1,14 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import Room, User, Office
 from app.schemas import RoomCreate, Room as RoomSchema
 from app.routers.auth import get_current_user
+from app.occupancy import occupancy_store
 from fastapi_pagination import Page
-from fastapi_pagination.ext.sqlalchemy import paginate
+from app.pagination import CursorPage, paginate_keyset, paginate_rows, schema_columns
+from app.read_cache import cached_response, read_cache
 
 router = APIRouter()
 
@@ -24,34 +26,61 @@ def create_room(
     db.add(db_room)
     db.commit()
     db.refresh(db_room)
+    read_cache.invalidate("rooms", "utilization")
     return db_room
 
 
 @router.get("/rooms/")
 def read_rooms(
+        request: Request,
         office_id: Optional[int] = Query(None, description="Filter by office ID"),
         capacity: Optional[int] = Query(None, description="Filter by capacity"),
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user)
 ) -> Page[RoomSchema]:
+    def build():
+        query = db.query(*schema_columns(Room, RoomSchema))
+        if office_id:
+            query = query.filter(Room.office_id == office_id)
+        if capacity:
+            query = query.filter(Room.capacity == capacity)
+        return paginate_rows(query, RoomSchema)
+
+    return cached_response(request, "rooms", build)
+
+
+@router.get("/rooms/cursor", response_model=CursorPage[RoomSchema])
+def read_rooms_cursor(
+        office_id: Optional[int] = Query(None, description="Filter by office ID"),
+        capacity: Optional[int] = Query(None, description="Filter by capacity"),
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+        size: int = Query(50, ge=1, le=100, description="Page size"),
+        include_total: bool = Query(True, description="Count all matching rooms"),
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+):
     query = db.query(Room)
     if office_id:
         query = query.filter(Room.office_id == office_id)
     if capacity:
         query = query.filter(Room.capacity == capacity)
-    return paginate(query)
+    return paginate_keyset(query, [Room.id], cursor, size, include_total)
 
 
 @router.get("/rooms/{room_id}", response_model=RoomSchema)
 def read_room(
         room_id: int,
+        request: Request,
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user)
 ):
-    db_room = db.query(Room).filter(Room.id == room_id).first()
-    if db_room is None:
-        raise HTTPException(status_code=404, detail="Room not found")
-    return db_room
+    def build():
+        db_room = db.query(Room).filter(Room.id == room_id).first()
+        if db_room is None:
+            raise HTTPException(status_code=404, detail="Room not found")
+        return RoomSchema.model_validate(db_room)
+
+    return cached_response(request, "rooms", build)
 
 
 @router.put("/rooms/{room_id}", response_model=RoomSchema)
@@ -73,6 +102,7 @@ def update_room(
 
     db.commit()
     db.refresh(db_room)
+    read_cache.invalidate("rooms", "utilization")
     return db_room
 
 
@@ -88,4 +118,6 @@ def delete_room(
 
     db.delete(db_room)
     db.commit()
+    occupancy_store.discard_rooms([room_id])
+    read_cache.invalidate("rooms", "utilization")
     return {"message": "Room deleted successfully"}
@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr, field_validator
+from typing import Optional, List, Literal
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 
 
 # Office schemas
@@ -92,8 +92,40 @@ class BookingBase(BaseModel):
         }
 
 
+class RecurrenceRule(BaseModel):
+    frequency: Literal["daily", "weekly", "weekdays"]
+    count: Optional[int] = Field(None, ge=1, le=366)
+    until: Optional[datetime] = None
+
+    @field_validator('until', mode='before')
+    @classmethod
+    def parse_until(cls, value):
+        if isinstance(value, str):
+            try:
+                return datetime.strptime(value, '%d-%m-%Y %H:%M')
+            except ValueError:
+                raise ValueError('Invalid datetime format. Please use DD-MM-YYYY HH:MM')
+
+        return value
+
+    @model_validator(mode='after')
+    def count_or_until(self):
+        if (self.count is None) == (self.until is None):
+            raise ValueError('Provide exactly one of count or until')
+        return self
+
+    def __str__(self):
+        rule = "FREQ=WEEKLY" if self.frequency == "weekly" else "FREQ=DAILY"
+        if self.frequency == "weekdays":
+            rule += ";BYDAY=MO,TU,WE,TH,FR"
+        if self.count is not None:
+            return f"{rule};COUNT={self.count}"
+        return f"{rule};UNTIL={self.until.strftime('%Y%m%dT%H%M%S')}"
+
+
 class BookingCreate(BookingBase):
     room_id: int
+    recurrence: Optional[RecurrenceRule] = None
 
     class Config:
         json_schema_extra = {
@@ -108,7 +140,69 @@ class Booking(BookingBase):
     id: int
     room_id: int
     user_id: int
+    series_id: Optional[str] = None
 
     class Config:
         from_attributes = True
 
+
+class BookingOccurrence(BookingBase):
+    pass
+
+
+class RecurringBookingResult(BaseModel):
+    series_id: Optional[str] = None
+    created: List[Booking]
+    conflicts: List[BookingOccurrence]
+
+
+class AvailableSlot(BookingBase):
+    room: Room
+
+
+class BookingBatchCreate(BaseModel):
+    bookings: List[BookingCreate] = Field(min_length=1, max_length=500)
+    mode: Literal["all_or_nothing", "best_effort"] = "all_or_nothing"
+
+
+class BookingBatchItem(BaseModel):
+    index: int
+    booking: Optional[Booking] = None
+    error: Optional[str] = None
+
+
+class BookingBatchResult(BaseModel):
+    created: int
+    results: List[BookingBatchItem]
+
+
+class RoomUtilization(BaseModel):
+    room_id: int
+    name: str
+    booked_minutes: int
+    occupancy: float
+    by_hour: List[float]
+    by_weekday: List[float]
+
+
+class OfficeUtilization(BookingBase):
+    office_id: int
+    booked_minutes: int
+    occupancy: float
+    by_hour: List[float]
+    by_weekday: List[float]
+    rooms: List[RoomUtilization]
+
+
+class RoomCalendar(BaseModel):
+    room_id: int
+    name: str
+    # Seven base64 bitmaps, Monday first; bit i of a day is set when a booking touches slot i.
+    days: List[str]
+
+
+class OfficeCalendar(BaseModel):
+    office_id: int
+    week_start: str
+    slot_minutes: int
+    rooms: List[RoomCalendar]
@@ -0,0 +1,31 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+logger = logging.getLogger("office_booking")
+
+
+class StartupTimer:
+    """Wall time of each cold-start phase, reported once the app is ready to serve."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def mark(self, name: str, since: float):
+        self.phases[name] = time.perf_counter() - since
+
+    def report(self):
+        total = time.perf_counter() - self.started
+        phases = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items())
+        logger.info("Startup finished in %.0f ms (%s)", total * 1000, phases)
+        return total
@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class TokenCache:
+    """Bounded LRU of verified token payloads, each kept until its `exp`."""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[dict]:
+        with self._lock:
+            payload = self._entries.get(token)
+            if payload is None:
+                return None
+            if payload["exp"] <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return payload
+
+    def put(self, token: str, payload: dict):
+        if "exp" not in payload:
+            return
+        with self._lock:
+            self._entries[token] = payload
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, token: str):
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class TokenDenylist:
+    """Revoked token ids plus a per-user token version.
+
+    Revoking one token stores its `jti` until the token would have expired
+    anyway; revoking every token of a user bumps the user's version so tokens
+    issued with an older `ver` claim stop validating.
+    """
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def version(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    def revoke(self, payload: dict):
+        now = time.time()
+        with self._lock:
+            self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+            if payload.get("jti"):
+                self._revoked[payload["jti"]] = payload["exp"]
+
+    def revoke_user(self, user_id: int):
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def is_revoked(self, payload: dict) -> bool:
+        if payload.get("jti") in self._revoked:
+            return True
+        user_id = payload.get("uid")
+        return user_id is not None and payload.get("ver", 0) < self._versions.get(user_id, 0)
+
+    def clear(self):
+        with self._lock:
+            self._revoked.clear()
+            self._versions.clear()
+
+
+token_cache = TokenCache(int(os.getenv("TOKEN_CACHE_SIZE", "10000")))
+token_denylist = TokenDenylist()
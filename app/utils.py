@@ -1,24 +1,32 @@
 import os
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 secret_key = os.getenv('SECRET_KEY')
 algorithm = os.getenv('ALGORITHM')
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# jose and passlib are imported on first use rather than at startup, which
+# keeps them (and the bcrypt backend probe) out of every worker's cold start.
+@lru_cache(maxsize=None)
+def password_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -30,6 +38,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def verify_token(token: str) -> Optional[dict]:
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, secret_key, algorithms=[algorithm])
         return payload
@@ -37,6 +47,13 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
+def parse_datetime(value: str) -> datetime:
+    try:
+        return datetime.strptime(value, '%d-%m-%Y %H:%M')
+    except ValueError:
+        raise ValueError('Invalid datetime format. Please use DD-MM-YYYY HH:MM')
+
+
 def end_time_must_be_after_start_time(start_time: datetime,
                                       end_time: datetime):
     if start_time >= end_time:
@@ -0,0 +1,106 @@
+"""Archival pass over a seeded history, and booking listings before vs. after it.
+
+    python -m benchmarks.archive --offices 10 --rooms 50 --bookings 400 --expired 0.9
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+from benchmarks.stats import summarize
+
+
+async def read_latencies(client, headers, paths, requests):
+    results = {}
+    for name, path in paths.items():
+        latencies, errors = [], 0
+        started = time.perf_counter()
+        for i in range(requests):
+            request_started = time.perf_counter()
+            response = await client.get(path(i), headers=headers)
+            latencies.append(time.perf_counter() - request_started)
+            errors += response.status_code != 200
+        results[name] = summarize(latencies, time.perf_counter() - started, errors)
+    return results
+
+
+async def run(args):
+    import httpx
+    from sqlalchemy import func, select
+    from app import archive
+    from app.database import SessionLocal, engine
+    from app.main import app
+    from app.models import ArchivedBooking, Booking
+    from app.utils import get_password_hash
+    from benchmarks.seed import seed
+
+    seed(engine, offices=args.offices, rooms_per_office=args.rooms, bookings_per_room=args.bookings, users=10,
+         hashed_password=get_password_hash("password"))
+    rooms = args.offices * args.rooms
+    with engine.connect() as conn:
+        total = conn.execute(select(func.count(Booking.id))).scalar()
+        cutoff = conn.execute(select(Booking.end_time).order_by(Booking.end_time)
+                              .offset(int(total * args.expired)).limit(1)).scalar()
+    recent = cutoff.strftime("%d-%m-%Y %H:%M")
+    paths = {
+        "user_recent": lambda i: f"/bookings/?start_time={recent}",
+        "room_recent": lambda i: f"/bookings/?room_id={i % rooms + 1}&start_time={recent}",
+        "user_recent_export": lambda i: f"/bookings/export?start_time={recent}",
+        "user_all": lambda i: "/bookings/",
+        "room_all": lambda i: f"/bookings/?room_id={i % rooms + 1}",
+    }
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        token = (await client.post("/token", data={"username": "user1@example.com", "password": "password"})) \
+            .json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        before = await read_latencies(client, headers, paths, args.requests)
+
+        batches = []
+        archive_batch = archive.archive_batch
+
+        def timed_batch(*batch_args):
+            started = time.perf_counter()
+            result = archive_batch(*batch_args)
+            batches.append(time.perf_counter() - started)
+            return result
+
+        archive.archive_batch = timed_batch
+        started = time.perf_counter()
+        moved = archive.archive_bookings(SessionLocal, now=cutoff + timedelta(days=archive.BOOKING_ARCHIVE_AFTER_DAYS),
+                                         pause=0)
+        elapsed = time.perf_counter() - started
+        archive.archive_batch = archive_batch
+        after = await read_latencies(client, headers, paths, args.requests)
+
+    with engine.connect() as conn:
+        hot = conn.execute(select(func.count(Booking.id))).scalar()
+        archived = conn.execute(select(func.count(ArchivedBooking.id))).scalar()
+    print(f"archived {moved} of {total} bookings in {elapsed:.2f}s ({moved / elapsed:.0f} rows/s), "
+          f"{len(batches)} batches, longest {max(batches) * 1000:.1f} ms; bookings {hot}, archive {archived}")
+    for name in paths:
+        print(f"{name:>20}: p50 {before[name]['p50_ms']:7.2f} -> {after[name]['p50_ms']:7.2f} ms"
+              f"  p95 {before[name]['p95_ms']:7.2f} -> {after[name]['p95_ms']:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--offices", type=int, default=10)
+    parser.add_argument("--rooms", type=int, default=50, help="rooms per office")
+    parser.add_argument("--bookings", type=int, default=400, help="bookings per room")
+    parser.add_argument("--expired", type=float, default=0.9, help="share of the bookings old enough to archive")
+    parser.add_argument("--requests", type=int, default=100, help="requests per read scenario")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
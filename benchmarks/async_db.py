@@ -0,0 +1,88 @@
+"""Throughput of the sync (threadpool) vs. async (AsyncSession) database layer.
+
+    python -m benchmarks.async_db --clients 50 200 1000 --requests 1000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.stats import percentile
+
+
+async def drive(client, headers, clients, requests, rooms):
+    latencies, errors = [], []
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            path = f"/rooms/{i % rooms + 1}" if i % 2 else f"/bookings/?room_id={i % rooms + 1}&size=10"
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    return {"clients": clients, "requests": requests, "errors": len(errors), "req_per_s": requests / elapsed,
+            "p50_ms": percentile(latencies, 0.5) * 1000, "p99_ms": percentile(latencies, 0.99) * 1000}
+
+
+async def child(args):
+    import httpx
+    from sqlalchemy import create_engine
+    from app.main import app
+    from app.utils import get_password_hash
+    from benchmarks.seed import seed
+
+    seed(create_engine(os.environ["DATABASE_URL"]), offices=5, rooms_per_office=20, bookings_per_room=50,
+         users=10, hashed_password=get_password_hash("password"))
+    # Pool timeouts surface as 500s and are counted instead of aborting the run.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                 timeout=None) as client:
+        token = (await client.post("/token", data={"username": "user1@example.com", "password": "password"})) \
+            .json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        await drive(client, headers, 10, 200, 100)
+        for clients in args.clients:
+            print(json.dumps(await drive(client, headers, clients, args.requests, 100)), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--requests", type=int, default=1000, help="requests per concurrency level")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.child:
+        asyncio.run(child(args))
+        return
+
+    for mode in ("sync", "async"):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(directory, 'bench.db')}",
+                       DATABASE_ASYNC="true" if mode == "async" else "false")
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.async_db", "--child", "--requests", str(args.requests),
+                 "--clients", *map(str, args.clients)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+        for line in output.splitlines():
+            if line.startswith("{"):
+                result = json.loads(line)
+                print(f"{mode:>5} {result['clients']:5d} clients: {result['req_per_s']:8.1f} req/s"
+                      f"  p50 {result['p50_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms  errors {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Free-room search: anti-join query vs. one conflict query per room.
+
+    python -m benchmarks.available_rooms --offices 20 --rooms 250 --bookings 200
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Room
+from app.routers.availability import available_rooms_query
+from app.routers.booking import check_booking_conflict_db
+from benchmarks.seed import BASE_TIME, seed
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return result, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--offices", type=int, default=20)
+    parser.add_argument("--rooms", type=int, default=250, help="rooms per office")
+    parser.add_argument("--bookings", type=int, default=200, help="bookings per room")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        started = time.perf_counter()
+        seed(engine, offices=args.offices, rooms_per_office=args.rooms, bookings_per_room=args.bookings)
+        total = args.offices * args.rooms * args.bookings
+        print(f"seeded {args.offices * args.rooms} rooms / {total} bookings in {time.perf_counter() - started:.1f}s")
+
+        db = sessionmaker(bind=engine)()
+        start_time = BASE_TIME + timedelta(days=args.bookings // 32, hours=2)
+        end_time = start_time + timedelta(hours=1)
+        office_id = args.offices // 2 + 1
+
+        def anti_join():
+            return [room.id for room in available_rooms_query(db, office_id, start_time, end_time, 6)]
+
+        def per_room():
+            rooms = db.query(Room).filter(Room.office_id == office_id, Room.capacity >= 6).all()
+            return [room.id for room in rooms
+                    if not check_booking_conflict_db(db, room.id, start_time, end_time)]
+
+        fast, fast_samples = timed(anti_join, args.repeat)
+        slow, slow_samples = timed(per_room, args.repeat)
+        assert sorted(fast) == sorted(slow)
+        print(f"{len(fast)} free rooms out of {args.rooms}")
+        for name, samples in (("anti-join", fast_samples), ("per-room", slow_samples)):
+            print(f"{name:>10}: median {statistics.median(samples) * 1000:8.2f} ms"
+                  f"  max {max(samples) * 1000:8.2f} ms")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Booking write throughput as the number of contended rooms grows, with a double-booking check.
+
+    python -m benchmarks.booking_race --writers 32 --attempts 2000 --rooms 1 4 16 64
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+FIRST_SLOT = datetime(2031, 1, 6, 8, 0)
+SLOTS = 16
+
+
+async def run(args):
+    import httpx
+    from sqlalchemy import text
+    from app.database import engine
+    from app.main import app
+    from app.utils import get_password_hash
+    from benchmarks.seed import seed
+
+    seed(engine, offices=1, rooms_per_office=sum(args.rooms), bookings_per_room=0, users=10,
+         hashed_password=get_password_hash("password"))
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        token = (await client.post("/token", data={"username": "user1@example.com", "password": "password"})) \
+            .json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        first_room = 1
+        for rooms in args.rooms:
+            statuses = []
+            counter = iter(range(args.attempts))
+
+            async def writer():
+                for i in counter:
+                    # Half-hour steps with one-hour bookings: neighbouring attempts collide.
+                    start_time = FIRST_SLOT + timedelta(minutes=30 * (i // rooms % SLOTS))
+                    response = await client.post("/bookings/", headers=headers, json={
+                        "room_id": first_room + i % rooms,
+                        "start_time": start_time.strftime("%d-%m-%Y %H:%M"),
+                        "end_time": (start_time + timedelta(hours=1)).strftime("%d-%m-%Y %H:%M"),
+                    })
+                    statuses.append(response.status_code)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(writer() for _ in range(args.writers)))
+            elapsed = time.perf_counter() - started
+
+            with engine.connect() as conn:
+                double_booked = conn.execute(text(
+                    "SELECT count(*) FROM bookings a JOIN bookings b ON a.room_id = b.room_id AND a.id < b.id"
+                    " AND a.start_time < b.end_time AND a.end_time > b.start_time"
+                    " WHERE a.room_id BETWEEN :first AND :last"
+                ), {"first": first_room, "last": first_room + rooms - 1}).scalar()
+            print(f"{rooms:4d} rooms: {len(statuses) / elapsed:7.1f} attempts/s  {statuses.count(200):5d} booked"
+                  f"  {statuses.count(400):5d} rejected  {len(statuses) - statuses.count(200) - statuses.count(400)}"
+                  f" failed  {double_booked} double-booked")
+            first_room += rooms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=32, help="concurrent booking writers")
+    parser.add_argument("--attempts", type=int, default=2000, help="booking attempts per room count")
+    parser.add_argument("--rooms", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Office week calendar: first (loading) vs. later requests served from the occupancy store.
+
+    python -m benchmarks.calendar --rooms 500 --bookings 100 --requests 200
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.stats import summarize
+
+
+async def run(args):
+    import httpx
+    from app.database import engine
+    from app.main import app
+    from app.occupancy import WEEK_SLOTS, occupancy_store
+    from app.utils import get_password_hash
+    from benchmarks.seed import BASE_TIME, seed
+
+    seed(engine, offices=1, rooms_per_office=args.rooms, bookings_per_room=args.bookings, users=10,
+         hashed_password=get_password_hash("password"))
+    week = BASE_TIME.strftime("%d-%m-%Y")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        token = (await client.post("/token", data={"username": "user1@example.com", "password": "password"})) \
+            .json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async def timed_calendar():
+            started = time.perf_counter()
+            response = await client.get("/offices/1/calendar", params={"week": week}, headers=headers)
+            return time.perf_counter() - started, response
+
+        cold_latencies = []
+        for _ in range(args.cold):
+            occupancy_store.clear()
+            elapsed, response = await timed_calendar()
+            cold_latencies.append(elapsed)
+        size = len(response.content)
+
+        warm_latencies, errors = [], 0
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            elapsed, response = await timed_calendar()
+            warm_latencies.append(elapsed)
+            errors += response.status_code != 200
+        warm = summarize(warm_latencies, time.perf_counter() - started, errors)
+    cold = summarize(cold_latencies, sum(cold_latencies), 0)
+
+    print(f"{args.rooms} rooms x {args.bookings} bookings, response {size / 1024:.0f} KiB, "
+          f"store {args.rooms * WEEK_SLOTS / 1024:.0f} KiB for the week")
+    print(f"  loading: p50 {cold['p50_ms']:7.2f} ms  p95 {cold['p95_ms']:7.2f} ms")
+    print(f"   cached: p50 {warm['p50_ms']:7.2f} ms  p95 {warm['p95_ms']:7.2f} ms  {warm['req_per_s']:.0f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=500)
+    parser.add_argument("--bookings", type=int, default=100, help="bookings per room, about six days' worth")
+    parser.add_argument("--requests", type=int, default=200, help="requests against the filled store")
+    parser.add_argument("--cold", type=int, default=20, help="requests that each start from an empty store")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Load test of the main endpoints against a seeded dataset, with JSON results for comparing runs.
+
+    python -m benchmarks.load --offices 10 --rooms 50 --bookings 100 --output results.json
+    python -m benchmarks.load --database big.db --offices 50 --rooms 200 --bookings 100  # 1M bookings
+    python -m benchmarks.load --compare baseline.json results.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.stats import summarize
+
+USERS = 100
+
+
+def booking_body(room_id, start_time):
+    return {"room_id": room_id, "start_time": start_time.strftime("%d-%m-%Y %H:%M"),
+            "end_time": (start_time + timedelta(hours=1)).strftime("%d-%m-%Y %H:%M")}
+
+
+def scenarios(args, rooms, first_free_slot):
+    """(name, requests, request factory, response hook) in the order they run.
+
+    Bookings are created from first_free_slot on, one hour every two hours
+    per room, and the update scenario then moves each of them half an hour
+    later.
+    """
+    from benchmarks.seed import BASE_TIME
+
+    created = {}
+
+    def remember(i, response):
+        created[i] = response.json()["id"]
+
+    middle = (BASE_TIME + timedelta(hours=args.bookings)).strftime("%d-%m-%Y %H:%M")
+    plan = [
+        ("login", max(1, args.requests // 10),
+         lambda i: ("POST", "/token", {"data": {"username": f"user{i % USERS + 1}@example.com",
+                                                 "password": "password"}}), None),
+        ("booking_create", args.requests,
+         lambda i: ("POST", "/bookings/", {"json": booking_body(
+             i % rooms + 1, first_free_slot + timedelta(hours=2 * (i // rooms)))}),
+         remember),
+        ("booking_update", args.requests,
+         lambda i: ("PUT", f"/bookings/{created.get(i, 0)}", {"json": booking_body(
+             i % rooms + 1, first_free_slot + timedelta(hours=2 * (i // rooms), minutes=30))}), None),
+    ]
+    reads = [
+        ("read_bookings", lambda i: "/bookings/"),
+        ("read_bookings_user_id", lambda i: "/bookings/?user_id=1"),
+        ("read_bookings_room_id", lambda i: f"/bookings/?room_id={i % rooms + 1}"),
+        ("read_bookings_start_time", lambda i: f"/bookings/?start_time={middle}"),
+        ("read_bookings_end_time", lambda i: f"/bookings/?end_time={middle}"),
+        ("read_bookings_all_filters",
+         lambda i: f"/bookings/?user_id=1&room_id={i % rooms + 1}&start_time=01-01-2000 00:00&end_time={middle}"),
+        ("read_rooms", lambda i: f"/rooms/?page={i % 5 + 1}"),
+        ("read_rooms_office_id", lambda i: f"/rooms/?office_id={i % args.offices + 1}"),
+        ("read_room", lambda i: f"/rooms/{i % rooms + 1}"),
+        ("read_offices", lambda i: "/offices/"),
+        ("read_offices_location", lambda i: f"/offices/?location=City {i % 10}"),
+    ]
+    plan += [(name, args.requests, lambda i, path=path: ("GET", path(i), {}), None) for name, path in reads]
+    return plan
+
+
+async def measure(client, headers, requests, concurrency, make_request, on_response=None):
+    latencies, errors = [], 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            method, path, kwargs = make_request(i)
+            started = time.perf_counter()
+            response = await client.request(method, path, headers=headers, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+            elif on_response is not None:
+                on_response(i, response)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+async def run(args, fresh):
+    import httpx
+    from sqlalchemy import func, select
+    from app.database import engine
+    from app.main import app
+    from app.models import Booking
+    from app.utils import get_password_hash
+    from benchmarks.seed import BASE_TIME, seed
+
+    rooms = args.offices * args.rooms
+    if fresh:
+        started = time.perf_counter()
+        seed(engine, offices=args.offices, rooms_per_office=args.rooms, bookings_per_room=args.bookings,
+             users=USERS, seed_value=args.seed, hashed_password=get_password_hash("password"))
+        print(f"seeded {rooms} rooms / {rooms * args.bookings} bookings in {time.perf_counter() - started:.1f}s",
+              file=sys.stderr)
+
+    # Start after every existing booking so a reused database never conflicts.
+    with engine.connect() as conn:
+        last_end = conn.execute(select(func.max(Booking.end_time))).scalar() or BASE_TIME
+    first_free_slot = datetime.combine(last_end.date() + timedelta(days=1), BASE_TIME.time())
+
+    results = {}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        token = (await client.post("/token", data={"username": "user1@example.com", "password": "password"})) \
+            .json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for name, requests, make_request, on_response in scenarios(args, rooms, first_free_slot):
+            results[name] = await measure(client, None if name == "login" else headers, requests,
+                                          args.concurrency, make_request, on_response)
+            print(f"{name:>26}: {results[name]['req_per_s']:8.1f} req/s  p50 {results[name]['p50_ms']:8.2f} ms"
+                  f"  p95 {results[name]['p95_ms']:8.2f} ms  p99 {results[name]['p99_ms']:8.2f} ms"
+                  f"  errors {results[name]['errors']}", file=sys.stderr)
+    return results
+
+
+def metadata(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "dataset": {"offices": args.offices, "rooms_per_office": args.rooms, "bookings_per_room": args.bookings,
+                    "users": USERS, "seed": args.seed},
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+    }
+
+
+def compare(baseline_path, current_path, tolerance):
+    with open(baseline_path) as baseline_file, open(current_path) as current_file:
+        baseline, current = json.load(baseline_file), json.load(current_file)
+    regressions = 0
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        change = (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        flag = "REGRESSION" if change > tolerance else ""
+        regressions += bool(flag)
+        print(f"{name:>26}: p95 {before['p95_ms']:8.2f} -> {result['p95_ms']:8.2f} ms ({change:+.0%})"
+              f"  req/s {before['req_per_s']:8.1f} -> {result['req_per_s']:8.1f}  {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--offices", type=int, default=10)
+    parser.add_argument("--rooms", type=int, default=50, help="rooms per office")
+    parser.add_argument("--bookings", type=int, default=100, help="seeded bookings per room")
+    parser.add_argument("--seed", type=int, default=42, help="random seed of the dataset")
+    parser.add_argument("--database", help="SQLite file to seed once and reuse (default: a temporary file)")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario (login runs a tenth)")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="compare two result files and exit 1 on a p95 regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 increase for --compare")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.tolerance) else 0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.abspath(args.database or os.path.join(directory, "bench.db"))
+        os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+        fresh = not os.path.exists(database)
+        results = {"meta": metadata(args), "scenarios": asyncio.run(run(args, fresh))}
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Request latency with logging written inline vs. through the queue listener.
+
+    python -m benchmarks.logging_pipeline --clients 50 --requests 2000 --disk-delay-ms 0 1
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.async_db import drive
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def child(args):
+    if args.disk_delay_ms:
+        # Stands in for a slow or contended log volume.
+        from logging.handlers import RotatingFileHandler
+        emit = RotatingFileHandler.emit
+
+        def slow_emit(self, record):
+            time.sleep(args.disk_delay_ms / 1000)
+            emit(self, record)
+
+        RotatingFileHandler.emit = slow_emit
+
+    import httpx
+    from sqlalchemy import create_engine
+    from app.log_pipeline import dropped_records
+    from app.main import app
+    from app.utils import get_password_hash
+    from benchmarks.seed import seed
+
+    seed(create_engine(os.environ["DATABASE_URL"]), offices=5, rooms_per_office=20, bookings_per_room=50,
+         users=10, hashed_password=get_password_hash("password"))
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        token = (await client.post("/token", data={"username": "user1@example.com", "password": "password"})) \
+            .json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        await drive(client, headers, 10, 200, 100)
+        result = await drive(client, headers, args.clients, args.requests, 100)
+    print(json.dumps(dict(result, dropped=dropped_records())), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--disk-delay-ms", type=float, nargs="+", default=[0, 1],
+                        help="added to every log file write")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.child:
+        args.disk_delay_ms = args.disk_delay_ms[0]
+        asyncio.run(child(args))
+        return
+
+    for delay in args.disk_delay_ms:
+        for mode in ("inline", "queue"):
+            # Each run logs into its own directory; every request is access-logged.
+            with tempfile.TemporaryDirectory() as directory:
+                env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(directory, 'bench.db')}",
+                           LOG_QUEUE="true" if mode == "queue" else "false", ACCESS_LOG_SAMPLE_RATE="1",
+                           BOOKING_ARCHIVE_AFTER_DAYS="0",
+                           PYTHONPATH=os.pathsep.join(filter(None, [REPO, os.environ.get("PYTHONPATH")])))
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.logging_pipeline", "--child", "--clients", str(args.clients),
+                     "--requests", str(args.requests), "--disk-delay-ms", str(delay)],
+                    env=env, cwd=directory, check=True, capture_output=True, text=True,
+                ).stdout
+            result = json.loads(output.splitlines()[-1])
+            print(f"disk +{delay:g} ms {mode:>6}: {result['req_per_s']:8.1f} req/s  p50 {result['p50_ms']:8.2f} ms"
+                  f"  p99 {result['p99_ms']:8.2f} ms  errors {result['errors']}  dropped {result['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Read latency of GET /rooms/{id} while a login storm is running.
+
+    python -m benchmarks.login_storm --logins 40 --concurrency 16
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.stats import percentile
+
+
+def report(name, samples):
+    print(f"{name:>14}: n={len(samples):5d}  p50 {percentile(samples, 0.50) * 1000:7.2f} ms"
+          f"  p95 {percentile(samples, 0.95) * 1000:7.2f} ms  p99 {percentile(samples, 0.99) * 1000:7.2f} ms")
+
+
+async def read_loop(client, headers, stop, samples):
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/rooms/1", headers=headers)
+        samples.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.text
+
+
+async def run(args):
+    import httpx
+    from sqlalchemy import create_engine
+    from app.main import app
+    from app.utils import get_password_hash
+    from benchmarks.seed import seed
+
+    seed(create_engine(os.environ["DATABASE_URL"]), offices=2, rooms_per_office=10, bookings_per_room=10,
+         users=50, hashed_password=get_password_hash("password"))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        token = (await client.post("/token", data={"username": "user1@example.com", "password": "password"})) \
+            .json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for phase in ("idle", "login storm"):
+            samples, stop = [], asyncio.Event()
+            readers = [asyncio.create_task(read_loop(client, headers, stop, samples)) for _ in range(args.readers)]
+            started = time.perf_counter()
+            if phase == "idle":
+                await asyncio.sleep(args.idle)
+                statuses = []
+            else:
+                queue = list(range(args.logins))
+                statuses = []
+
+                async def login_worker():
+                    while queue:
+                        user = queue.pop() % 50 + 1
+                        response = await client.post(
+                            "/token", data={"username": f"user{user}@example.com", "password": "password"})
+                        statuses.append(response.status_code)
+
+                await asyncio.gather(*(login_worker() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+            stop.set()
+            await asyncio.gather(*readers)
+            report(phase, samples)
+            if statuses:
+                print(f"{'':>14}  {statuses.count(200)} logins ok, {statuses.count(503)} shed (503) "
+                      f"in {elapsed:.1f}s = {len(statuses) / elapsed:.1f} logins/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent login clients")
+    parser.add_argument("--readers", type=int, default=4, help="concurrent read clients")
+    parser.add_argument("--idle", type=float, default=3.0, help="seconds of reads without logins")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""A traffic spike with and without admission control: latency of served requests and how fast the rest fail.
+
+    python -m benchmarks.overload --clients 100 --requests 500
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import timedelta
+
+from benchmarks.stats import percentile
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def child(args):
+    import httpx
+    from sqlalchemy import create_engine
+    from app.main import app
+    from app.utils import get_password_hash
+    from benchmarks.seed import BASE_TIME, seed
+
+    rooms = 100
+    seed(create_engine(os.environ["DATABASE_URL"]), offices=5, rooms_per_office=rooms // 5, bookings_per_room=50,
+         users=10, hashed_password=get_password_hash("password"))
+    first_free = BASE_TIME + timedelta(days=60)
+    # Without admission control, requests queue until the connection pool gives up on them.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        token = (await client.post("/token", data={"username": "user1@example.com", "password": "password"})) \
+            .json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        served, failed, statuses = [], [], Counter()
+        counter = iter(range(args.requests))
+
+        async def worker():
+            for i in counter:
+                started = time.perf_counter()
+                if i % 5 == 0:
+                    start_time = first_free + timedelta(hours=2 * (i // 5 // rooms))
+                    response = await client.post("/bookings/", headers=headers, json={
+                        "room_id": i // 5 % rooms + 1, "start_time": start_time.strftime("%d-%m-%Y %H:%M"),
+                        "end_time": (start_time + timedelta(hours=1)).strftime("%d-%m-%Y %H:%M")})
+                else:
+                    response = await client.get(f"/bookings/?room_id={i % rooms + 1}&size=10", headers=headers)
+                elapsed = time.perf_counter() - started
+                statuses[response.status_code] += 1
+                (served if response.status_code < 500 else failed).append(elapsed)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.clients)))
+        elapsed = time.perf_counter() - started
+    print(json.dumps({
+        "served_per_s": len(served) / elapsed, "statuses": statuses,
+        "served_p50_ms": percentile(served, 0.5) * 1000 if served else 0,
+        "served_p99_ms": percentile(served, 0.99) * 1000 if served else 0,
+        "failed_p50_ms": percentile(failed, 0.5) * 1000 if failed else 0,
+    }), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.child:
+        asyncio.run(child(args))
+        return
+
+    for mode in ("off", "on"):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(directory, 'bench.db')}",
+                       ADMISSION_CONTROL="true" if mode == "on" else "false", BOOKING_ARCHIVE_AFTER_DAYS="0",
+                       PYTHONPATH=os.pathsep.join(filter(None, [REPO, os.environ.get("PYTHONPATH")])))
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.overload", "--child", "--clients", str(args.clients),
+                 "--requests", str(args.requests)],
+                env=env, cwd=directory, check=True, capture_output=True, text=True,
+            ).stdout
+        result = json.loads(output.splitlines()[-1])
+        statuses = " ".join(f"{status}:{count}" for status, count in sorted(result["statuses"].items()))
+        print(f"admission {mode:>3}: {result['served_per_s']:7.1f} served/s  served p50 {result['served_p50_ms']:8.1f} ms"
+              f"  p99 {result['served_p99_ms']:8.1f} ms  failures p50 {result['failed_p50_ms']:8.1f} ms  [{statuses}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.database import Base
+from app.models import Booking, Office, Room, User
+
+BASE_TIME = datetime(2030, 1, 7, 8, 0)
+CHUNK_SIZE = 50000
+
+
+def _chunks(rows, size=CHUNK_SIZE):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def seed(engine, offices=20, rooms_per_office=250, bookings_per_room=200, users=100, seed_value=42,
+         hashed_password="x"):
+    """Fill an empty database with a reproducible dataset using bulk inserts.
+
+    Every room gets `bookings_per_room` one-hour bookings laid out on a
+    half-hour grid from BASE_TIME, so rooms are busy about two thirds of the
+    time and never double-booked.
+    """
+    rng = random.Random(seed_value)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "hashed_password": hashed_password}
+            for i in range(1, users + 1)
+        ])
+        conn.execute(insert(Office), [
+            {"id": i, "name": f"Office {i}", "location": f"City {i % 10}"} for i in range(1, offices + 1)
+        ])
+        conn.execute(insert(Room), [
+            {"id": (office_id - 1) * rooms_per_office + i, "name": f"Room {office_id}-{i}",
+             "capacity": rng.choice((4, 6, 8, 12, 20)), "office_id": office_id}
+            for office_id in range(1, offices + 1) for i in range(1, rooms_per_office + 1)
+        ])
+
+    def bookings():
+        for room_id in range(1, offices * rooms_per_office + 1):
+            start_time = BASE_TIME
+            for _ in range(bookings_per_room):
+                start_time += timedelta(minutes=30 * rng.randint(0, 2))
+                yield {"room_id": room_id, "user_id": rng.randint(1, users),
+                       "start_time": start_time, "end_time": start_time + timedelta(hours=1)}
+                start_time += timedelta(hours=1)
+
+    for chunk in _chunks(bookings()):
+        with engine.begin() as conn:
+            conn.execute(insert(Booking), chunk)
@@ -0,0 +1,100 @@
+"""Rows/s of the list endpoints: pydantic Page[...] serialization vs. the row-tuple fast path.
+
+    python -m benchmarks.serialization --pages 50 --size 100
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+
+def serializers(db, model, schema, size):
+    from fastapi.responses import JSONResponse
+    from fastapi_pagination import Page, Params
+    from app.pagination import paginate_rows, schema_columns
+
+    def pydantic_page(page):
+        # ORM entities validated into schema, dumped, then JSON-encoded.
+        params = Params(page=page, size=size)
+        query = db.query(model)
+        total = query.order_by(None).count()
+        rows = query.limit(size).offset(size * (page - 1)).all()
+        return JSONResponse(Page[schema].create([schema.model_validate(row) for row in rows], params,
+                                                total=total).model_dump(mode="json")).body
+
+    def row_page(page):
+        return paginate_rows(db.query(*schema_columns(model, schema)), schema, Params(page=page, size=size)).body
+
+    return {"pydantic": pydantic_page, "rows": row_page}
+
+
+def rows_per_second(fn, pages, size):
+    started = time.perf_counter()
+    for page in range(1, pages + 1):
+        fn(page)
+    return pages * size / (time.perf_counter() - started)
+
+
+async def endpoint_rows_per_second(client, headers, path, pages, size):
+    started = time.perf_counter()
+    for page in range(1, pages + 1):
+        response = await client.get(path, params={"page": page, "size": size}, headers=headers)
+        assert response.status_code == 200, response.text
+    return pages * size / (time.perf_counter() - started)
+
+
+async def run(args):
+    import httpx
+    from app.database import SessionLocal, engine
+    from app.main import app
+    from app.models import Booking, Office, Room
+    from app.schemas import Booking as BookingSchema, Office as OfficeSchema, Room as RoomSchema
+    from app.utils import get_password_hash
+    from benchmarks.seed import seed
+
+    rows = args.pages * args.size
+    seed(engine, offices=rows, rooms_per_office=1, bookings_per_room=1, users=1,
+         hashed_password=get_password_hash("password"))
+    endpoints = [("/offices/", Office, OfficeSchema), ("/rooms/", Room, RoomSchema),
+                 ("/bookings/", Booking, BookingSchema)]
+
+    db = SessionLocal()
+    try:
+        results = {path: {name: rows_per_second(fn, args.pages, args.size)
+                          for name, fn in serializers(db, model, schema, args.size).items()}
+                   for path, model, schema in endpoints}
+    finally:
+        db.close()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        token = (await client.post("/token", data={"username": "user1@example.com", "password": "password"})) \
+            .json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for path, _, _ in endpoints:
+            results[path]["http"] = await endpoint_rows_per_second(client, headers, path, args.pages, args.size)
+
+    print(f"{rows} rows per table, pages of {args.size}")
+    for path, result in results.items():
+        print(f"{path:>11}: pydantic {result['pydantic']:9.0f} rows/s  rows {result['rows']:9.0f} rows/s"
+              f"  ({result['rows'] / result['pydantic']:.1f}x)  endpoint {result['http']:9.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--size", type=int, default=100, help="page size, at most 100")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        # Every page is built, never served from the read cache.
+        os.environ["READ_CACHE_SIZE"] = "0"
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
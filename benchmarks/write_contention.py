@@ -0,0 +1,113 @@
+"""Concurrent booking writers against SQLite's defaults vs. the tuned engine profile.
+
+    python -m benchmarks.write_contention --writers 32 --readers 8 --bookings 2000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.stats import percentile
+
+# SQLAlchemy's stock QueuePool size and no pragmas: what the app ran with before.
+PROFILES = {
+    "default": {"SQLITE_PRAGMAS": "", "DATABASE_POOL_SIZE": "5", "DATABASE_MAX_OVERFLOW": "10"},
+    "tuned": {},
+}
+ROOMS = 20
+
+
+async def child(args):
+    import httpx
+    from sqlalchemy import event
+    from app.database import engine
+    from app.main import app
+    from app.utils import get_password_hash
+    from benchmarks.seed import seed
+
+    seed(engine, offices=1, rooms_per_office=ROOMS, bookings_per_room=200, users=10,
+         hashed_password=get_password_hash("password"))
+    locked = []
+
+    @event.listens_for(engine, "handle_error")
+    def count_locked(context):
+        if "database is locked" in str(context.original_exception):
+            locked.append(1)
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        token = (await client.post("/token", data={"username": "user1@example.com", "password": "password"})) \
+            .json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        first_slot = datetime(2031, 1, 6, 8, 0)
+        latencies, statuses, reads = [], [], []
+        counter = iter(range(args.bookings))
+        done = asyncio.Event()
+
+        async def writer():
+            for i in counter:
+                start_time = first_slot + timedelta(hours=i // ROOMS)
+                started = time.perf_counter()
+                response = await client.post("/bookings/", headers=headers, json={
+                    "room_id": i % ROOMS + 1,
+                    "start_time": start_time.strftime("%d-%m-%Y %H:%M"),
+                    "end_time": (start_time + timedelta(hours=1)).strftime("%d-%m-%Y %H:%M"),
+                })
+                latencies.append(time.perf_counter() - started)
+                statuses.append(response.status_code)
+
+        async def reader(n):
+            while not done.is_set():
+                response = await client.get(f"/bookings/?room_id={n % ROOMS + 1}&size=50", headers=headers)
+                reads.append(response.status_code)
+
+        readers = [asyncio.create_task(reader(n)) for n in range(args.readers)]
+        started = time.perf_counter()
+        await asyncio.gather(*(writer() for _ in range(args.writers)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await asyncio.gather(*readers)
+
+    print(json.dumps({
+        "writes": len(statuses), "ok": statuses.count(200), "failed": len(statuses) - statuses.count(200),
+        "locked": len(locked), "writes_per_s": statuses.count(200) / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000, "p99_ms": percentile(latencies, 0.99) * 1000,
+        "reads": len(reads), "reads_failed": len(reads) - reads.count(200),
+    }), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=32, help="concurrent booking writers")
+    parser.add_argument("--readers", type=int, default=8, help="concurrent readers of /bookings/")
+    parser.add_argument("--bookings", type=int, default=2000, help="bookings to create")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.child:
+        asyncio.run(child(args))
+        return
+
+    for profile, overrides in PROFILES.items():
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(directory, 'bench.db')}", **overrides)
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.write_contention", "--child", "--writers", str(args.writers),
+                 "--readers", str(args.readers), "--bookings", str(args.bookings)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+        result = json.loads(output.splitlines()[-1])
+        print(f"{profile:>8}: {result['ok']}/{result['writes']} writes ok, {result['locked']} 'database is locked'"
+              f"  {result['writes_per_s']:7.1f} writes/s  p50 {result['p50_ms']:7.2f} ms"
+              f"  p99 {result['p99_ms']:8.2f} ms  reads {result['reads']} ({result['reads_failed']} failed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import asyncio
+
+from app.admission import Gate, RateLimiter, admission, client_key, route_class
+
+
+def test_gate_queues_then_sheds_by_size_and_deadline():
+    async def scenario():
+        gate = Gate(limit=1, queue_size=1, timeout=0.05)
+        assert await gate.acquire() is None
+        waiting = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        assert (gate.queued, await gate.acquire()) == (1, "queue_full")
+        gate.release()
+        assert await waiting is None
+        assert await gate.acquire() == "timeout"
+        gate.release()
+        return gate
+
+    gate = asyncio.run(scenario())
+    assert (gate.active, gate.queued, gate.admitted, gate.shed) == (0, 0, 2, {"queue_full": 1, "timeout": 1})
+
+
+def test_rate_limiter_refills_per_client():
+    limiter = RateLimiter(rate=2, burst=2)
+    assert [limiter.retry_after("user:a", now=100.0) for _ in range(3)] == [0, 0, 0.5]
+    assert limiter.retry_after("user:b", now=100.0) == 0
+    assert limiter.retry_after("user:a", now=100.5) == 0
+    assert limiter.limited == 1
+
+
+def test_route_classes():
+    assert route_class("POST", "/token") == "auth"
+    assert route_class("POST", "/bookings/") == "write"
+    assert route_class("GET", "/bookings/") == "read"
+
+
+def test_overload_is_shed_with_retry_after(client, access_token, monkeypatch):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    monkeypatch.setitem(admission.gates, "read", Gate(limit=0, queue_size=0, timeout=0.01))
+    monkeypatch.setattr(admission, "rate_limiter", RateLimiter(rate=1, burst=1))
+
+    shed = client.get("/offices/", headers=headers)
+    assert (shed.status_code, shed.headers["retry-after"]) == (503, "1")
+    limited = client.post("/offices/", headers=headers, json={"name": "HQ", "location": "Tashkent"})
+    assert (limited.status_code, limited.headers["retry-after"]) == (429, "1")
+
+    text = client.get("/metrics").text
+    assert 'office_booking_admission_shed_total{class="read",reason="queue_full"} 1' in text
+    assert "office_booking_rate_limited_total 1" in text
+    assert client_key({"headers": [], "client": ("10.0.0.1", 1234)}) == "address:10.0.0.1"
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+from app.archive import archive_bookings, booking_source
+from app.models import ArchivedBooking, Booking
+from test.conftest import TestingSessionLocal
+
+
+def add_bookings(test_db, room_id, user_id, start_time, count):
+    bookings = [Booking(room_id=room_id, user_id=user_id, start_time=start_time + timedelta(days=i),
+                        end_time=start_time + timedelta(days=i, hours=1)) for i in range(count)]
+    test_db.add_all(bookings)
+    test_db.commit()
+    return [booking.id for booking in bookings]
+
+
+def test_archived_bookings_stay_readable(client, test_db, test_room, test_user, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    future_ids = add_bookings(test_db, test_room.id, test_user.id, datetime(2030, 1, 7, 9, 0), 2)
+    past_ids = add_bookings(test_db, test_room.id, test_user.id, datetime(2020, 1, 6, 9, 0), 5)
+
+    assert archive_bookings(TestingSessionLocal, batch_size=2, pause=0) == 5
+    assert test_db.query(ArchivedBooking.id).order_by(ArchivedBooking.id).all() == [(i,) for i in past_ids]
+    assert {i for i, in test_db.query(Booking.id)} == set(future_ids)
+
+    listed = client.get("/bookings/", params={"size": 10}, headers=headers).json()
+    assert listed["total"] == 7
+    cursor = client.get("/bookings/cursor", params={"start_time": "01-01-2020 00:00"}, headers=headers).json()
+    assert [item["id"] for item in cursor["items"]] == past_ids + future_ids
+    export = client.get("/bookings/export", params={"end_time": "01-01-2021 00:00"}, headers=headers)
+    assert len(export.text.splitlines()) == 5
+
+    archived = client.get(f"/bookings/{past_ids[0]}", headers=headers)
+    assert archived.status_code == 200
+    assert archived.json()["start_time"] == "06-01-2020 09:00"
+    assert client.put(f"/bookings/{past_ids[0]}", headers=headers, json={
+        "room_id": test_room.id, "start_time": "06-01-2020 09:00", "end_time": "06-01-2020 10:00"}).status_code == 404
+
+    # The archived ids are above every id left in bookings and are never handed out again.
+    created = client.post("/bookings/", headers=headers, json={
+        "room_id": test_room.id, "start_time": "07-02-2030 09:00", "end_time": "07-02-2030 10:00"})
+    assert created.json()["id"] > past_ids[-1]
+
+
+def test_recent_ranges_skip_the_archive():
+    assert booking_source() is not Booking
+    assert booking_source(datetime(2020, 1, 1)) is not Booking
+    assert booking_source(datetime.utcnow() - timedelta(days=30)) is Booking
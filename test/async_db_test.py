@@ -0,0 +1,65 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastapi_pagination import add_pagination
+from sqlalchemy.pool import NullPool
+from app.aio import asyncify
+from app.database import get_async_db
+from app.routers import auth, office, room, booking, availability
+from test.conftest import SQLALCHEMY_DATABASE_URL
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def async_client(client):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    engine = create_async_engine(SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://"),
+                                 poolclass=NullPool)
+    session_factory = async_sessionmaker(engine, autoflush=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    for router in (auth.router, office.router, room.router, booking.router, availability.router):
+        app.include_router(asyncify(router))
+    add_pagination(app)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as async_client:
+        yield async_client
+
+
+def test_async_routers_serve_the_booking_flow(async_client, test_user):
+    token = async_client.post("/token", data={"username": "test@example.com", "password": "testpassword"}) \
+        .json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    office_id = async_client.post("/offices/", json={"name": "HQ", "location": "Tashkent"}, headers=headers) \
+        .json()["id"]
+    room_id = async_client.post("/rooms/", json={"name": "Focus", "capacity": 4, "office_id": office_id},
+                                headers=headers).json()["id"]
+    start_time = datetime(2030, 1, 7, 9, 0)
+    slot = {"room_id": room_id, "start_time": start_time.strftime('%d-%m-%Y %H:%M'),
+            "end_time": (start_time + timedelta(hours=1)).strftime('%d-%m-%Y %H:%M')}
+
+    response = async_client.post("/bookings/", json=slot, headers=headers)
+    assert response.status_code == 200
+    booking_id = response.json()["id"]
+    assert async_client.post("/bookings/", json=slot, headers=headers).status_code == 400
+
+    page = async_client.get("/bookings/", headers=headers).json()
+    assert page["total"] == 1
+    assert page["items"][0]["start_time"] == "07-01-2030 09:00"
+    assert async_client.get("/rooms/cursor", headers=headers).json()["items"][0]["id"] == room_id
+    export = async_client.get("/bookings/export", headers=headers)
+    assert [json.loads(line)["id"] for line in export.text.splitlines()] == [booking_id]
+
+    assert async_client.delete(f"/bookings/{booking_id}", headers=headers).status_code == 200
+    assert async_client.get(f"/bookings/{booking_id}", headers=headers).status_code == 404
+    assert async_client.post("/register", json={"email": "new@example.com", "password": "secret"}) \
+        .status_code == 200
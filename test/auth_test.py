@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from app.hashing import HashingPool
+from app.routers import auth
+from test.conftest import engine
+
+
+def test_verified_tokens_are_cached(client, access_token, monkeypatch):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert client.get("/offices/", headers=headers).status_code == 200
+    decoded = []
+    monkeypatch.setattr(auth, "verify_token", lambda token: decoded.append(token))
+
+    for _ in range(3):
+        assert client.get("/offices/", headers=headers).status_code == 200
+    assert decoded == []
+
+
+def test_stateless_mode_skips_user_lookup(client, access_token, monkeypatch):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    monkeypatch.setattr(auth, "AUTH_STATELESS", True)
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        assert client.get("/offices/999", headers=headers).status_code == 404
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert not any("FROM users" in statement for statement in statements)
+
+
+def test_logout_revokes_token(client, test_user, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    other_token = client.post("/token", data={"username": "test@example.com", "password": "testpassword"}) \
+        .json()["access_token"]
+
+    assert client.post("/logout", headers=headers).status_code == 200
+    assert client.get("/offices/", headers=headers).status_code == 401
+    assert client.get("/offices/", headers={"Authorization": f"Bearer {other_token}"}).status_code == 200
+
+    assert client.post("/logout/all", headers={"Authorization": f"Bearer {other_token}"}).status_code == 200
+    assert client.get("/offices/", headers={"Authorization": f"Bearer {other_token}"}).status_code == 401
+    new_token = client.post("/token", data={"username": "test@example.com", "password": "testpassword"}) \
+        .json()["access_token"]
+    assert client.get("/offices/", headers={"Authorization": f"Bearer {new_token}"}).status_code == 200
+
+
+def test_register_then_login(client):
+    response = client.post("/register", json={"email": "new@example.com", "password": "secret"})
+    assert response.status_code == 200
+    assert response.json()["email"] == "new@example.com"
+    assert client.post("/register", json={"email": "new@example.com", "password": "secret"}).status_code == 400
+
+    response = client.post("/token", data={"username": "new@example.com", "password": "secret"})
+    assert response.status_code == 200
+    response = client.post("/token", data={"username": "new@example.com", "password": "wrong"})
+    assert response.status_code == 401
+
+
+def test_hashing_pool_sheds_load_when_saturated():
+    pool = HashingPool(workers=1, queue_limit=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool._run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as rejected:
+            await pool._run(release.wait)
+        release.set()
+        await asyncio.gather(*running)
+        return rejected.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == "1"
+    assert pool.pending == 0
+    assert pool.rejected == 1
@@ -0,0 +1,66 @@
+from datetime import datetime
+from app.models import Booking, Room
+
+
+def test_available_rooms_excludes_booked_and_small_rooms(client, test_db, test_office, test_room, test_user,
+                                                         access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    large = Room(name="Large Room", capacity=20, office_id=test_office.id)
+    small = Room(name="Small Room", capacity=4, office_id=test_office.id)
+    test_db.add_all([large, small])
+    test_db.commit()
+    test_db.add(Booking(room_id=test_room.id, user_id=test_user.id, start_time=datetime(2030, 1, 7, 9, 30),
+                        end_time=datetime(2030, 1, 7, 10, 30)))
+    test_db.commit()
+
+    response = client.get(f"/offices/{test_office.id}/available-rooms",
+                          params={"start": "07-01-2030 10:00", "end": "07-01-2030 11:00", "min_capacity": 5},
+                          headers=headers)
+    assert response.status_code == 200
+    assert [room["name"] for room in response.json()] == ["Large Room"]
+
+    response = client.get(f"/offices/{test_office.id}/available-rooms",
+                          params={"start": "07-01-2030 10:30", "end": "07-01-2030 11:00"}, headers=headers)
+    assert [room["name"] for room in response.json()] == ["Small Room", "Test Room", "Large Room"]
+
+
+def test_available_rooms_validates_input(client, test_office, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    params = {"start": "07-01-2030 11:00", "end": "07-01-2030 10:00"}
+
+    assert client.get(f"/offices/{test_office.id}/available-rooms", params=params,
+                      headers=headers).status_code == 400
+    assert client.get(f"/offices/{test_office.id}/available-rooms", params={**params, "start": "2030-01-07"},
+                      headers=headers).status_code == 400
+    assert client.get("/offices/999/available-rooms", params={"start": "07-01-2030 09:00", "end": params["end"]},
+                      headers=headers).status_code == 404
+
+
+def test_next_slot_ranks_earliest_start_then_best_fit(client, test_db, test_office, test_room, test_user,
+                                                      access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    large = Room(name="Large Room", capacity=20, office_id=test_office.id)
+    small = Room(name="Small Room", capacity=4, office_id=test_office.id)
+    test_db.add_all([large, small])
+    test_db.commit()
+    test_db.add_all([
+        # Test Room (capacity 10): the 30 minute gap at 10:00 is too short.
+        Booking(room_id=test_room.id, user_id=test_user.id, start_time=datetime(2030, 1, 7, 9, 0),
+                end_time=datetime(2030, 1, 7, 10, 0)),
+        Booking(room_id=test_room.id, user_id=test_user.id, start_time=datetime(2030, 1, 7, 10, 30),
+                end_time=datetime(2030, 1, 7, 11, 10)),
+        # Large Room is busy until after working hours.
+        Booking(room_id=large.id, user_id=test_user.id, start_time=datetime(2030, 1, 7, 8, 0),
+                end_time=datetime(2030, 1, 7, 17, 30)),
+    ])
+    test_db.commit()
+
+    response = client.get(f"/offices/{test_office.id}/next-slot",
+                          params={"start": "07-01-2030 08:00", "duration": 60, "min_capacity": 5},
+                          headers=headers)
+
+    assert response.status_code == 200
+    assert [(slot["room"]["name"], slot["start_time"], slot["end_time"]) for slot in response.json()] == [
+        ("Test Room", "07-01-2030 11:15", "07-01-2030 12:15"),
+        ("Large Room", "08-01-2030 09:00", "08-01-2030 10:00"),
+    ]
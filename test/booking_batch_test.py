@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from app.models import Booking
+from test.conftest import engine
+
+
+def slot(room_id, start_time, hours=1):
+    return {
+        "room_id": room_id,
+        "start_time": start_time.strftime('%d-%m-%Y %H:%M'),
+        "end_time": (start_time + timedelta(hours=hours)).strftime('%d-%m-%Y %H:%M')
+    }
+
+
+def count_statements(client, *args, **kwargs):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.post(*args, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return response, len(statements)
+
+
+def test_batch_creates_all_bookings_with_constant_queries(client, test_room, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    start_time = datetime(2030, 1, 7, 9, 0)
+
+    small = [slot(test_room.id, start_time + timedelta(hours=2 * i)) for i in range(2)]
+    response, small_count = count_statements(client, "/bookings/batch", json={"bookings": small},
+                                             headers=headers)
+    assert response.status_code == 200
+    assert response.json()["created"] == 2
+
+    large = [slot(test_room.id, start_time + timedelta(days=1, hours=2 * i)) for i in range(10)]
+    response, large_count = count_statements(client, "/bookings/batch", json={"bookings": large},
+                                             headers=headers)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["index"] for item in results] == list(range(10))
+    assert all(item["booking"]["room_id"] == test_room.id for item in results)
+    assert large_count == small_count
+
+
+def test_batch_all_or_nothing_rejects_whole_batch(client, test_db, test_room, test_user, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    start_time = datetime(2030, 1, 7, 9, 0)
+    test_db.add(Booking(room_id=test_room.id, user_id=test_user.id, start_time=start_time,
+                        end_time=start_time + timedelta(hours=1)))
+    test_db.commit()
+
+    bookings = [
+        slot(test_room.id, start_time + timedelta(hours=2)),
+        slot(test_room.id, start_time),
+        slot(test_room.id + 1, start_time),
+    ]
+    response = client.post("/bookings/batch", json={"bookings": bookings}, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == [
+        {"index": 1, "error": "Room is already booked for this time period"},
+        {"index": 2, "error": "Room not found"},
+    ]
+    assert test_db.query(Booking).count() == 1
+
+
+def test_batch_best_effort_books_what_it_can(client, test_room, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    start_time = datetime(2030, 1, 7, 9, 0)
+    bookings = [
+        slot(test_room.id, start_time, hours=2),
+        slot(test_room.id, start_time + timedelta(hours=1)),
+        slot(test_room.id, start_time + timedelta(hours=2)),
+    ]
+
+    response = client.post("/bookings/batch", json={"bookings": bookings, "mode": "best_effort"},
+                           headers=headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["results"][1]["error"] == "Room is already booked for this time period"
+    assert data["results"][1]["booking"] is None
+    # The batch is visible to the single-booking conflict check afterwards.
+    assert client.post("/bookings/", json=bookings[2], headers=headers).status_code == 400
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session, aliased
+
+from app.admission import Gate, admission
+from app.booking_locks import RoomLocks
+from app.database import create_database_engine
+from app.models import Booking, Room
+
+
+def overlapping_pairs(db):
+    other = aliased(Booking)
+    return db.query(func.count()).select_from(Booking).join(other, and_(
+        Booking.room_id == other.room_id,
+        Booking.id < other.id,
+        Booking.start_time < other.end_time,
+        Booking.end_time > other.start_time,
+    )).scalar()
+
+
+def test_room_locks_take_each_stripe_once_in_order():
+    locks = RoomLocks(8)
+    assert locks.stripes([17, 1, 9, None, 3]) == [1, 3]
+    with locks.hold([17, 3]):
+        with locks.hold([2]):
+            pass
+
+
+def test_concurrent_writers_never_double_book(client, test_db, test_office, test_room, access_token, monkeypatch):
+    # Every writer gets through; shedding under load is covered in admission_test.
+    monkeypatch.setitem(admission.gates, "write", Gate(limit=16, queue_size=64, timeout=60))
+    other_room = Room(name="Other", capacity=4, office_id=test_office.id)
+    test_db.add(other_room)
+    test_db.commit()
+    headers = {"Authorization": f"Bearer {access_token}"}
+    first_slot = datetime(2030, 1, 7, 9, 0)
+
+    def book(i):
+        # Every slot is requested by several writers, half an hour apart, in both rooms.
+        start_time = first_slot + timedelta(minutes=30 * (i % 8))
+        return client.post("/bookings/", headers=headers, json={
+            "room_id": (test_room.id, other_room.id)[i % 2],
+            "start_time": start_time.strftime('%d-%m-%Y %H:%M'),
+            "end_time": (start_time + timedelta(hours=1)).strftime('%d-%m-%Y %H:%M'),
+        }).status_code
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        statuses = list(pool.map(book, range(64)))
+
+    assert set(statuses) <= {200, 400}
+    test_db.expire_all()
+    assert test_db.query(Booking).count() == statuses.count(200)
+    assert overlapping_pairs(test_db) == 0
+
+
+def test_writes_from_another_process_are_seen(client, test_room, test_user, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert client.post("/bookings/", headers=headers, json={
+        "room_id": test_room.id, "start_time": "07-01-2030 09:00", "end_time": "07-01-2030 10:00"}).status_code == 200
+
+    # Another worker or the importer, with its own engine.
+    other_engine = create_database_engine("sqlite:///./test.db")
+    with Session(other_engine) as other:
+        other.add(Booking(room_id=test_room.id, user_id=test_user.id,
+                          start_time=datetime(2030, 1, 7, 11, 0), end_time=datetime(2030, 1, 7, 12, 0)))
+        other.commit()
+    other_engine.dispose()
+
+    response = client.post("/bookings/", headers=headers, json={
+        "room_id": test_room.id, "start_time": "07-01-2030 11:00", "end_time": "07-01-2030 12:00"})
+    assert response.status_code == 400
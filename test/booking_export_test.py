@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+from app.models import Booking, User
+from app.routers import booking
+
+
+def add_bookings(test_db, room_id, user_id, count, start_time=datetime(2030, 1, 7, 9, 0)):
+    test_db.add_all([Booking(room_id=room_id, user_id=user_id, start_time=start_time + timedelta(hours=2 * i),
+                             end_time=start_time + timedelta(hours=2 * i + 1)) for i in range(count)])
+    test_db.commit()
+
+
+def test_export_streams_own_bookings_as_ndjson(client, test_db, test_room, test_user, access_token, monkeypatch):
+    monkeypatch.setattr(booking, "EXPORT_BATCH_SIZE", 2)
+    other = User(email="other@example.com", hashed_password="x")
+    test_db.add(other)
+    test_db.commit()
+    add_bookings(test_db, test_room.id, test_user.id, 5)
+    add_bookings(test_db, test_room.id, other.id, 1, datetime(2030, 2, 1, 9, 0))
+
+    response = client.get("/bookings/export", headers={"Authorization": f"Bearer {access_token}"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 5
+    assert rows[0] == {"id": rows[0]["id"], "room_id": test_room.id, "user_id": test_user.id,
+                       "start_time": "07-01-2030 09:00", "end_time": "07-01-2030 10:00", "series_id": None}
+    page = client.get("/bookings/", params={"size": 5},
+                      headers={"Authorization": f"Bearer {access_token}"}).json()["items"]
+    assert sorted(rows, key=lambda row: row["id"]) == sorted(page, key=lambda row: row["id"])
+
+
+def test_export_csv_applies_filters(client, test_db, test_room, test_user, access_token):
+    add_bookings(test_db, test_room.id, test_user.id, 4)
+
+    response = client.get("/bookings/export", params={"format": "csv", "start_time": "07-01-2030 11:00",
+                                                      "end_time": "07-01-2030 14:00"},
+                          headers={"Authorization": f"Bearer {access_token}"})
+
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "room_id", "user_id", "start_time", "end_time", "series_id"]
+    assert [row[3] for row in rows[1:]] == ["07-01-2030 11:00", "07-01-2030 13:00"]
+
+
+def test_export_rejects_malformed_times(client, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    for params in ({"start_time": "garbage"}, {"end_time": "2030-01-07T11:00"}):
+        response = client.get("/bookings/export", params=params, headers=headers)
+        assert (response.status_code, response.json()["detail"]) == \
+            (400, "Invalid datetime format. Please use DD-MM-YYYY HH:MM")
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from app.models import Booking
+
+
+def recurring(room_id, start_time, **recurrence):
+    return {
+        "room_id": room_id,
+        "start_time": start_time.strftime('%d-%m-%Y %H:%M'),
+        "end_time": (start_time + timedelta(minutes=30)).strftime('%d-%m-%Y %H:%M'),
+        "recurrence": recurrence
+    }
+
+
+def test_weekly_series_is_booked_in_one_request(client, test_room, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    start_time = datetime(2030, 1, 7, 9, 30)
+
+    response = client.post("/bookings/recurring", json=recurring(test_room.id, start_time, frequency="weekly", count=52),
+                           headers=headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["created"]) == 52
+    assert data["conflicts"] == []
+    assert {booking["series_id"] for booking in data["created"]} == {data["series_id"]}
+    assert data["created"][-1]["start_time"] == (start_time + timedelta(weeks=51)).strftime('%d-%m-%Y %H:%M')
+    single = {key: value for key, value in data["created"][3].items() if key in ("room_id", "start_time", "end_time")}
+    assert client.post("/bookings/", json=single, headers=headers).status_code == 400
+
+
+def test_weekdays_until_skips_weekends(client, test_room, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    # Saturday 5th to Friday 11th January 2030.
+    response = client.post("/bookings/recurring",
+                           json=recurring(test_room.id, datetime(2030, 1, 5, 9, 0), frequency="weekdays",
+                                          until="11-01-2030 23:59"),
+                           headers=headers)
+
+    assert response.status_code == 200
+    starts = [booking["start_time"] for booking in response.json()["created"]]
+    assert starts == [f"{day:02d}-01-2030 09:00" for day in range(7, 12)]
+
+
+def test_conflicting_occurrences_are_reported_or_skipped(client, test_db, test_room, test_user, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    start_time = datetime(2030, 1, 7, 9, 30)
+    test_db.add(Booking(room_id=test_room.id, user_id=test_user.id, start_time=start_time + timedelta(days=2),
+                        end_time=start_time + timedelta(days=2, hours=1)))
+    test_db.commit()
+    payload = recurring(test_room.id, start_time, frequency="daily", count=5)
+
+    response = client.post("/bookings/recurring", json=payload, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"]["conflicts"] == [
+        {"start_time": "09-01-2030 09:30", "end_time": "09-01-2030 10:00"}
+    ]
+    assert test_db.query(Booking).count() == 1
+
+    response = client.post("/bookings/recurring", params={"skip_conflicts": True}, json=payload, headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()["created"]) == 4
+    assert response.json()["conflicts"] == [{"start_time": "09-01-2030 09:30", "end_time": "09-01-2030 10:00"}]
+
+
+def test_recurrence_requires_count_or_until(client, test_room, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    payload = recurring(test_room.id, datetime(2030, 1, 7, 9, 30), frequency="daily")
+
+    assert client.post("/bookings/recurring", json=payload, headers=headers).status_code == 422
+    payload["recurrence"]["count"] = 3
+    assert client.post("/bookings/", json=payload, headers=headers).status_code == 400
@@ -1,84 +1,7 @@
-import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from datetime import datetime, timedelta
 import datetime as base_datetime
-from app.main import app
-from app.database import Base, get_db
-from app.models import User, Office, Room, Booking
-from app.utils import get_password_hash
-
-# Test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
-
-
-app.dependency_overrides[get_db] = override_get_db
-
-
-@pytest.fixture
-def client():
-    Base.metadata.create_all(bind=engine)
-    yield TestClient(app)
-    Base.metadata.drop_all(bind=engine)
-
-
-@pytest.fixture
-def test_db():
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-@pytest.fixture
-def test_user(test_db):
-    user = User(
-        email="test@example.com",
-        hashed_password=get_password_hash("testpassword"),
-    )
-    test_db.add(user)
-    test_db.commit()
-    test_db.refresh(user)
-    return user
-
-
-@pytest.fixture
-def test_office(test_db):
-    office = Office(name="Test Office", location="Test Location")
-    test_db.add(office)
-    test_db.commit()
-    test_db.refresh(office)
-    return office
-
-
-@pytest.fixture
-def test_room(test_db, test_office):
-    room = Room(name="Test Room", capacity=10, office_id=test_office.id)
-    test_db.add(room)
-    test_db.commit()
-    test_db.refresh(room)
-    return room
-
-
-@pytest.fixture
-def access_token(client, test_user):
-    response = client.post(
-        "/token",
-        data={"username": "test@example.com", "password": "testpassword"}
-    )
-    return response.json()["access_token"]
+from app.models import Booking
+from app.booking_index import RoomIntervals
 
 
 def test_create_booking(client, test_room, access_token):
@@ -147,3 +70,50 @@ def test_delete_booking(client, test_db, test_room, test_user, access_token):
 
     assert response.status_code == 200
     assert response.json()["message"] == "Booking deleted successfully"
+
+
+def test_room_intervals_overlaps():
+    base = datetime(2024, 10, 19, 9, 0)
+    intervals = RoomIntervals()
+    intervals.add(1, base, base + timedelta(hours=1))
+    intervals.add(2, base + timedelta(hours=2), base + timedelta(hours=3))
+
+    assert intervals.overlaps(base + timedelta(minutes=30), base + timedelta(minutes=90))
+    assert intervals.overlaps(base - timedelta(hours=1), base + timedelta(hours=4))
+    assert not intervals.overlaps(base + timedelta(hours=1), base + timedelta(hours=2))
+    assert not intervals.overlaps(base, base + timedelta(hours=1), exclude_id=1)
+
+    intervals.remove(1, base)
+    assert not intervals.overlaps(base, base + timedelta(hours=1))
+
+
+def test_deleted_and_moved_bookings_free_their_slot(client, test_room, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    start_time = datetime.now(base_datetime.UTC) + timedelta(days=1)
+    slot = {
+        "room_id": test_room.id,
+        "start_time": start_time.strftime('%d-%m-%Y %H:%M'),
+        "end_time": (start_time + timedelta(hours=1)).strftime('%d-%m-%Y %H:%M')
+    }
+    later_slot = dict(slot, start_time=(start_time + timedelta(hours=2)).strftime('%d-%m-%Y %H:%M'),
+                      end_time=(start_time + timedelta(hours=3)).strftime('%d-%m-%Y %H:%M'))
+
+    booking_id = client.post("/bookings/", json=slot, headers=headers).json()["id"]
+    assert client.post("/bookings/", json=slot, headers=headers).status_code == 400
+
+    assert client.put(f"/bookings/{booking_id}", json=later_slot, headers=headers).status_code == 200
+    assert client.post("/bookings/", json=later_slot, headers=headers).status_code == 400
+    moved_back_id = client.post("/bookings/", json=slot, headers=headers).json()["id"]
+
+    assert client.delete(f"/bookings/{moved_back_id}", headers=headers).status_code == 200
+    assert client.post("/bookings/", json=slot, headers=headers).status_code == 200
+
+
+def test_moving_a_booking_to_an_unknown_room_is_404(client, test_room, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    slot = {"room_id": test_room.id, "start_time": "07-01-2030 09:00", "end_time": "07-01-2030 10:00"}
+    booking_id = client.post("/bookings/", json=slot, headers=headers).json()["id"]
+
+    response = client.put(f"/bookings/{booking_id}", json=dict(slot, room_id=test_room.id + 1000), headers=headers)
+    assert (response.status_code, response.json()["detail"]) == (404, "Room not found")
+    assert client.get(f"/bookings/{booking_id}", headers=headers).json()["room_id"] == test_room.id
@@ -0,0 +1,85 @@
+import base64
+from datetime import datetime
+
+from app.models import Booking, Room
+from app.occupancy import WEEK_SLOTS, OccupancyStore
+
+
+def busy_slots(day: str):
+    bits = int.from_bytes(base64.b64decode(day), "big")
+    return [slot for slot in range(96) if bits >> (95 - slot) & 1]
+
+
+def test_calendar_marks_touched_slots_and_follows_writes(client, test_db, test_office, test_room, test_user,
+                                                         access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    other = Room(name="Other Room", capacity=4, office_id=test_office.id)
+    test_db.add(other)
+    test_db.commit()
+    test_db.add_all([
+        Booking(room_id=test_room.id, user_id=test_user.id,
+                start_time=datetime(2030, 1, 7, 9, 0), end_time=datetime(2030, 1, 7, 10, 0)),
+        # Runs into the next week; only Sunday 23:30-24:00 belongs to this one.
+        Booking(room_id=other.id, user_id=test_user.id,
+                start_time=datetime(2030, 1, 13, 23, 30), end_time=datetime(2030, 1, 14, 0, 30)),
+    ])
+    test_db.commit()
+    url = f"/offices/{test_office.id}/calendar"
+
+    calendar = client.get(url, params={"week": "09-01-2030"}, headers=headers).json()
+    assert (calendar["week_start"], calendar["slot_minutes"]) == ("07-01-2030 00:00", 15)
+    room, empty = calendar["rooms"]
+    assert (room["room_id"], busy_slots(room["days"][0])) == (test_room.id, [36, 37, 38, 39])
+    assert [busy_slots(day) for day in empty["days"]] == [[]] * 6 + [[94, 95]]
+
+    # Two short bookings share the 10:00 slot; it stays busy until both are gone.
+    first = client.post("/bookings/", headers=headers, json={
+        "room_id": test_room.id, "start_time": "07-01-2030 10:00", "end_time": "07-01-2030 10:05"}).json()
+    second = client.post("/bookings/", headers=headers, json={
+        "room_id": test_room.id, "start_time": "07-01-2030 10:10", "end_time": "07-01-2030 10:20"}).json()
+    assert busy_slots(client.get(url, params={"week": "07-01-2030"}, headers=headers)
+                      .json()["rooms"][0]["days"][0]) == [36, 37, 38, 39, 40, 41]
+    client.delete(f"/bookings/{first['id']}", headers=headers)
+    assert busy_slots(client.get(url, params={"week": "07-01-2030"}, headers=headers)
+                      .json()["rooms"][0]["days"][0]) == [36, 37, 38, 39, 40, 41]
+    client.put(f"/bookings/{second['id']}", headers=headers, json={
+        "room_id": other.id, "start_time": "08-01-2030 12:00", "end_time": "08-01-2030 12:15"})
+    days = client.get(url, params={"week": "07-01-2030"}, headers=headers).json()["rooms"]
+    assert busy_slots(days[0]["days"][0]) == [36, 37, 38, 39]
+    assert busy_slots(days[1]["days"][1]) == [48]
+
+    next_week = client.get(url, params={"week": "14-01-2030"}, headers=headers).json()
+    assert busy_slots(next_week["rooms"][1]["days"][0]) == [0, 1]
+    assert client.get(url, params={"week": "2030-01-14"}, headers=headers).status_code == 400
+    assert client.get("/offices/999/calendar", headers=headers).status_code == 404
+
+
+def test_week_loaded_between_commit_and_apply_is_not_stored(client, test_db, test_room, test_user):
+    store = OccupancyStore()
+    week = datetime(2030, 1, 7)
+    booking = Booking(room_id=test_room.id, user_id=test_user.id,
+                      start_time=datetime(2030, 1, 7, 9, 0), end_time=datetime(2030, 1, 7, 10, 0))
+    with store.writing(test_room.id):
+        test_db.add(booking)
+        test_db.commit()
+        assert store.week(test_db, [test_room.id], week)[test_room.id][36:40] == b"\x01" * 4
+        store.add(booking.room_id, booking.start_time, booking.end_time)
+
+    with store.writing(test_room.id):
+        test_db.delete(booking)
+        test_db.commit()
+        store.remove(test_room.id, datetime(2030, 1, 7, 9, 0), datetime(2030, 1, 7, 10, 0))
+    assert store.week(test_db, [test_room.id], week)[test_room.id] == bytes(WEEK_SLOTS)
+
+
+def test_stored_weeks_expire(client, test_db, test_room, test_user):
+    store = OccupancyStore(ttl=5)
+    week = datetime(2030, 1, 7)
+    assert store.week(test_db, [test_room.id], week, now=100.0)[test_room.id] == bytes(WEEK_SLOTS)
+
+    # Written by another process, so this store is never told.
+    test_db.add(Booking(room_id=test_room.id, user_id=test_user.id,
+                        start_time=datetime(2030, 1, 7, 9, 0), end_time=datetime(2030, 1, 7, 10, 0)))
+    test_db.commit()
+    assert store.week(test_db, [test_room.id], week, now=104.0)[test_room.id] == bytes(WEEK_SLOTS)
+    assert store.week(test_db, [test_room.id], week, now=105.0)[test_room.id][36:40] == b"\x01" * 4
@@ -0,0 +1,90 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, create_database_engine, get_db
+from app.models import User, Office, Room
+from app.utils import get_password_hash
+from app.token_cache import token_cache, token_denylist
+from app.read_cache import read_cache
+from app.occupancy import occupancy_store
+from app.metrics import instrument, metrics
+from app import profiler
+
+# Test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+engine = create_database_engine(SQLALCHEMY_DATABASE_URL)
+instrument(engine)
+profiler.instrument(engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db
+
+
+@pytest.fixture
+def client():
+    Base.metadata.create_all(bind=engine)
+    token_cache.clear()
+    token_denylist.clear()
+    read_cache.clear()
+    occupancy_store.clear()
+    metrics.clear()
+    yield TestClient(app)
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def test_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def test_user(test_db):
+    user = User(
+        email="test@example.com",
+        hashed_password=get_password_hash("testpassword"),
+    )
+    test_db.add(user)
+    test_db.commit()
+    test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def test_office(test_db):
+    office = Office(name="Test Office", location="Test Location")
+    test_db.add(office)
+    test_db.commit()
+    test_db.refresh(office)
+    return office
+
+
+@pytest.fixture
+def test_room(test_db, test_office):
+    room = Room(name="Test Room", capacity=10, office_id=test_office.id)
+    test_db.add(room)
+    test_db.commit()
+    test_db.refresh(room)
+    return room
+
+
+@pytest.fixture
+def access_token(client, test_user):
+    response = client.post(
+        "/token",
+        data={"username": "test@example.com", "password": "testpassword"}
+    )
+    return response.json()["access_token"]
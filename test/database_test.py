@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta
+
+from app.database import parse_pragmas
+from app.models import Booking
+from test.conftest import engine
+
+
+def test_parse_pragmas():
+    assert parse_pragmas("journal_mode=WAL, foreign_keys=ON,") == [("journal_mode", "WAL"), ("foreign_keys", "ON")]
+    assert parse_pragmas("") == []
+
+
+def test_connections_use_tuned_profile(client):
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == -65536
+
+
+def test_deleting_room_cascades_to_bookings(client, test_db, test_room, test_user, access_token):
+    start_time = datetime(2030, 1, 7, 9, 0)
+    test_db.add(Booking(room_id=test_room.id, user_id=test_user.id,
+                        start_time=start_time, end_time=start_time + timedelta(hours=1)))
+    test_db.commit()
+
+    response = client.delete(f"/rooms/{test_room.id}", headers={"Authorization": f"Bearer {access_token}"})
+
+    assert response.status_code == 200
+    test_db.expire_all()
+    assert test_db.query(Booking).count() == 0
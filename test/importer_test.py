@@ -0,0 +1,63 @@
+import io
+import json
+
+from app.importer import Importer, read_rows
+from app.models import Booking, Room
+from test.conftest import engine
+
+
+def test_import_resolves_names_and_rejects_bad_rows(client, test_db, test_user, tmp_path):
+    offices = tmp_path / "offices.csv"
+    offices.write_text("name,location\nNorth,Oslo\nSouth,Rome\nBroken,\n")
+    rooms = tmp_path / "rooms.jsonl"
+    rooms.write_text("\n".join(json.dumps(row) for row in [
+        {"office": "North", "name": "Fjord", "capacity": 8},
+        {"office": "South", "name": "Tiber"},
+        {"office": "Nowhere", "name": "Lost"},
+    ]) + "\n{\"office\": \"North\",\n[1, 2]\n")
+    bookings = tmp_path / "bookings.csv"
+    bookings.write_text(
+        "office,room,start_time,end_time\n"
+        "North,Fjord,07-01-2030 11:00,07-01-2030 12:00\n"
+        "North,Fjord,07-01-2030 09:00,07-01-2030 10:00\n"
+        "North,Fjord,07-01-2030 09:30,07-01-2030 10:30\n"
+        "South,Tiber,07-01-2030 09:30,07-01-2030 09:00\n"
+        "South,Tiber,2030-01-07 09:00,2030-01-07 10:00\n"
+        "South,Tiber,07-01-2030 09:00,07-01-2030 10:00\n"
+    )
+    rejects = io.StringIO()
+    importer = Importer(engine, chunk_size=2, chunks_per_transaction=1, default_user=test_user.email,
+                        rejects=rejects)
+
+    assert (importer.offices(read_rows(str(offices))).imported, importer.rooms(read_rows(str(rooms))).imported) == (2, 2)
+    report = importer.bookings(read_rows(str(bookings)))
+
+    assert (report.imported, report.rejected) == (3, 3)
+    assert report.rows_per_second > 0
+    rejected = [json.loads(line) for line in rejects.getvalue().splitlines()]
+    assert [(row["kind"], row["line"]) for row in rejected] == [
+        ("offices", 3), ("rooms", 3), ("rooms", 4), ("rooms", 5), ("bookings", 3), ("bookings", 4), ("bookings", 5)]
+    assert rejected[2]["error"].startswith("Invalid JSON") and rejected[2]["row"] == '{"office": "North",\n'
+    assert rejected[3]["error"] == "Row must be a JSON object"
+    assert rejected[4]["error"] == "Room is already booked for this time period"
+    fjord = test_db.query(Room).filter(Room.name == "Fjord").one()
+    assert test_db.query(Booking).filter(Booking.room_id == fjord.id).count() == 2
+    assert {booking.user_id for booking in test_db.query(Booking)} == {test_user.id}
+
+
+def test_import_checks_overlaps_against_existing_bookings(client, test_db, test_room, access_token):
+    response = client.post("/bookings/", headers={"Authorization": f"Bearer {access_token}"},
+                           json={"room_id": test_room.id, "start_time": "07-01-2030 09:00",
+                                 "end_time": "07-01-2030 10:00"})
+    assert response.status_code == 200
+
+    report = Importer(engine).bookings([
+        {"room_id": test_room.id, "user_email": "test@example.com",
+         "start_time": "07-01-2030 09:30", "end_time": "07-01-2030 10:30"},
+        {"room_id": test_room.id, "user_email": "nobody@example.com",
+         "start_time": "07-01-2030 11:00", "end_time": "07-01-2030 12:00"},
+        {"room_id": test_room.id, "user_email": "test@example.com",
+         "start_time": "07-01-2030 10:00", "end_time": "07-01-2030 11:00"},
+    ])
+
+    assert (report.imported, report.rejected) == (1, 2)
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+import queue
+
+import pytest
+
+from app import log_pipeline
+from app.log_pipeline import AccessFormatter, DroppingQueueHandler
+
+
+def test_full_queue_drops_and_counts_records():
+    handler = DroppingQueueHandler(queue.Queue(2))
+    logger = logging.getLogger("test.log_pipeline")
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        for i in range(5):
+            logger.warning("record %d", i)
+    finally:
+        logger.removeHandler(handler)
+        logger.propagate = True
+
+    assert handler.dropped == 3
+    assert [handler.queue.get_nowait().getMessage() for _ in range(2)] == ["record 0", "record 1"]
+
+
+def test_access_log_records_latency_and_user(client, test_user, access_token, monkeypatch, caplog):
+    monkeypatch.setattr(log_pipeline, "ACCESS_LOG_SAMPLE_RATE", 0.0)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    with caplog.at_level(logging.INFO, logger="office_booking.access"):
+        client.get("/bookings/", headers=headers)
+        client.get("/bookings/999", headers=headers)
+        client.post("/offices/", headers=headers, json={"name": "Logged Office", "location": "Here"})
+
+    records = [record for record in caplog.records if record.name == "office_booking.access"]
+    entries = [record.msg for record in records]
+    # The successful read is sampled out; the miss and the write are always logged.
+    assert [(entry["method"], entry["path"], entry["status"]) for entry in entries] == [
+        ("GET", "/bookings/999", 404), ("POST", "/offices/", 200)]
+    assert all(entry["user_id"] == test_user.id and entry["ms"] >= 0 for entry in entries)
+    line = AccessFormatter().format(records[-1])
+    assert line.startswith('{"method":"POST","path":"/offices/","status":200,')
+
+
+def test_sampled_out_request_still_raises(monkeypatch):
+    monkeypatch.setattr(log_pipeline, "ACCESS_LOG_SAMPLE_RATE", 0.0)
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        raise RuntimeError("stream failed")
+
+    async def send(message):
+        pass
+
+    middleware = log_pipeline.AccessLogMiddleware(app)
+    with pytest.raises(RuntimeError, match="stream failed"):
+        asyncio.run(middleware({"type": "http", "method": "GET", "path": "/bookings/export"}, None, send))
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+from app.metrics import Histogram, render_histograms
+
+
+def sample(text, prefix):
+    return [line for line in text.splitlines() if line.startswith(prefix)]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram()
+    for value in (0.0005, 0.001, 0.02, 30.0):
+        histogram.observe(value)
+    lines = render_histograms("latency", "Latency.", {'route="/x"': histogram})
+
+    assert 'latency_bucket{route="/x",le="0.001"} 2' in lines
+    assert 'latency_bucket{route="/x",le="0.025"} 3' in lines
+    assert 'latency_bucket{route="/x",le="10.0"} 3' in lines
+    assert 'latency_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 'latency_count{route="/x"} 4' in lines
+
+
+def test_metrics_report_routes_queries_and_sections(client, test_room, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    start_time = datetime(2030, 1, 7, 9, 0)
+    client.post("/bookings/", headers=headers, json={
+        "room_id": test_room.id,
+        "start_time": start_time.strftime('%d-%m-%Y %H:%M'),
+        "end_time": (start_time + timedelta(hours=1)).strftime('%d-%m-%Y %H:%M'),
+    })
+    client.get("/bookings/", headers=headers)
+    client.get("/no-such-page")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+
+    assert "office_booking_requests_in_flight 1" in text
+    assert 'office_booking_responses_total{method="POST",route="/bookings/",status="200"} 1' in text
+    assert 'office_booking_responses_total{method="GET",route="unmatched",status="404"} 1' in text
+    assert 'office_booking_request_duration_seconds_count{method="GET",route="/bookings/"} 1' in text
+    queries = sample(text, 'office_booking_db_queries_total{method="GET",route="/bookings/"}')
+    assert int(queries[0].split()[-1]) == 3  # current user, page, count
+    for section in ("get_current_user", "check_booking_conflict", "pagination_count"):
+        assert f'office_booking_section_duration_seconds_count{{section="{section}"}}' in text
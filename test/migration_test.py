@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine
+
+from app.database import Base
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+UPGRADE = """
+import sys
+from alembic import command
+from alembic.config import Config
+config = Config("alembic.ini")
+config.set_main_option("sqlalchemy.url", sys.argv[1])
+command.upgrade(config, "head")
+"""
+
+
+def upgrade(url: str):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO, os.environ.get("PYTHONPATH")])))
+    subprocess.run([sys.executable, "-c", UPGRADE, url], cwd=os.path.join(REPO, "app"), env=env, check=True,
+                   capture_output=True)
+
+
+def test_migrations_build_the_schema_from_an_empty_database(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    upgrade(url)
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection), Base.metadata) == []
+        sql = connection.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = 'bookings'").scalar()
+    assert "AUTOINCREMENT" in sql
+    engine.dispose()
+
+
+def test_migrations_run_on_a_database_built_by_create_all(tmp_path):
+    url = f"sqlite:///{tmp_path / 'created.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    upgrade(url)
+
+    with engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection), Base.metadata) == []
+    engine.dispose()
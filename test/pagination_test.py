@@ -0,0 +1,55 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from app.models import Booking, Room
+
+
+def test_booking_cursor_pages_follow_start_time_order(client, test_db, test_office, test_user, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    rooms = [Room(name=f"Room {i}", capacity=4, office_id=test_office.id) for i in range(2)]
+    test_db.add_all(rooms)
+    test_db.commit()
+    start_time = datetime(2030, 1, 7, 9, 0)
+    # Two bookings share a start time so the id tie-breaker is exercised.
+    slots = [(rooms[0], 3), (rooms[0], 0), (rooms[1], 2), (rooms[0], 2), (rooms[1], 1)]
+    bookings = [Booking(room_id=room.id, user_id=test_user.id, start_time=start_time + timedelta(hours=hours),
+                        end_time=start_time + timedelta(hours=hours, minutes=30)) for room, hours in slots]
+    test_db.add_all(bookings)
+    test_db.commit()
+    expected = [booking.id for booking in sorted(bookings, key=lambda booking: (booking.start_time, booking.id))]
+
+    seen, cursor, totals = [], None, set()
+    while True:
+        params = {"size": 2, **({"cursor": cursor} if cursor else {})}
+        data = client.get("/bookings/cursor", params=params, headers=headers).json()
+        seen += [item["id"] for item in data["items"]]
+        totals.add(data["total"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == expected
+    assert totals == {5}
+    data = client.get("/bookings/cursor", params={"include_total": False}, headers=headers).json()
+    assert data["total"] is None
+    assert data["items"][0]["start_time"] == "07-01-2030 09:00"
+
+
+def test_room_cursor_rejects_garbage_cursor(client, test_db, test_office, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    test_db.add_all([Room(name=f"Room {i}", capacity=4, office_id=test_office.id) for i in range(3)])
+    test_db.commit()
+
+    first = client.get("/rooms/cursor", params={"size": 2}, headers=headers).json()
+    second = client.get("/rooms/cursor", params={"size": 2, "cursor": first["next_cursor"]}, headers=headers).json()
+    assert [room["name"] for room in first["items"] + second["items"]] == ["Room 0", "Room 1", "Room 2"]
+    assert second["next_cursor"] is None
+
+    assert client.get("/rooms/cursor", params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+    for params in ({"start_time": "bad"}, {"end_time": "2030-01-07 09:00"}):
+        assert client.get("/bookings/cursor", params=params, headers=headers).status_code == 400
+        assert client.get("/bookings/", params=params, headers=headers).status_code == 400
+    for tampered in ([1, 1], [None, 1], ["2030-01-07T09:00:00", [1]]):
+        cursor = base64.urlsafe_b64encode(json.dumps(tampered).encode()).decode()
+        assert client.get("/bookings/cursor", params={"cursor": cursor}, headers=headers).status_code == 400
+    assert client.get("/offices/cursor", headers=headers).json()["total"] == 1
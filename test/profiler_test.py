@@ -0,0 +1,55 @@
+import logging
+from datetime import datetime, timedelta
+
+from app import profiler
+from app.models import Booking
+
+
+def test_profile_summary_header_is_opt_in(client, test_room, access_token, monkeypatch):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert "x-sql-profile" not in client.get("/bookings/", headers={**headers, "X-SQL-Profile": "1"}).headers
+
+    monkeypatch.setattr(profiler, "SQL_PROFILE", "header")
+    assert "x-sql-profile" not in client.get("/bookings/", headers=headers).headers
+    summary = client.get("/bookings/", headers={**headers, "X-SQL-Profile": "1"}).headers["x-sql-profile"]
+    assert summary.startswith("queries=3; total_ms=")
+    assert "slow=0" in summary
+
+
+def test_repeated_lazy_loads_are_flagged(client, test_db, test_room, test_user):
+    start_time = datetime(2030, 1, 7, 9, 0)
+    for day in range(4):
+        test_db.add(Booking(room_id=test_room.id, user_id=test_user.id,
+                            start_time=start_time + timedelta(days=day),
+                            end_time=start_time + timedelta(days=day, hours=1)))
+    test_db.commit()
+    test_db.expire_all()
+
+    profile = profiler.RequestProfile("test")
+    token = profiler.current_profile.set(profile)
+    try:
+        # A fresh identity map per booking forces one Booking.room load each.
+        for booking_id, in test_db.query(Booking.id).all():
+            test_db.expunge_all()
+            test_db.get(Booking, booking_id).room.name
+    finally:
+        profiler.current_profile.reset(token)
+
+    repeated = dict(profile.repeated())
+    assert any("FROM rooms" in statement and count == 4 for statement, count in repeated.items())
+    assert 'top_repeated="4x SELECT' in profile.summary()
+
+
+def test_slow_queries_are_logged_with_plan(client, test_db, test_room, monkeypatch, caplog):
+    monkeypatch.setattr(profiler, "SLOW_QUERY_SECONDS", 0.0)
+    token = profiler.current_profile.set(profiler.RequestProfile("test"))
+    try:
+        with caplog.at_level(logging.WARNING, logger="office_booking.slow_sql"):
+            test_db.query(Booking).filter(Booking.room_id == test_room.id).all()
+    finally:
+        profiler.current_profile.reset(token)
+
+    message = caplog.records[-1].getMessage()
+    assert "Slow query" in message and "FROM bookings" in message
+    assert f"params=({test_room.id}," in message
+    assert "plan: SEARCH bookings USING INDEX ix_bookings_room_id_start_time_end_time" in message
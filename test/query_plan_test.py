@@ -0,0 +1,77 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import User, Booking
+from app.routers.booking import booking_conflict_query, filter_bookings
+from app.routers.availability import available_rooms_query
+from app.pagination import after
+
+
+@pytest.fixture
+def plan_db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def query_plan(db, query):
+    statement = query.statement if hasattr(query, "statement") else query
+    compiled = statement.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+    return [row[-1] for row in rows]
+
+
+def assert_no_table_scan(plan):
+    assert plan
+    for step in plan:
+        assert not step.startswith("SCAN bookings"), plan
+
+
+def test_conflict_query_uses_range_scan(plan_db):
+    query = booking_conflict_query(plan_db, 1, datetime(2024, 10, 19, 10, 0), datetime(2024, 10, 19, 11, 0),
+                                   booking_id=7)
+    plan = query_plan(plan_db, query)
+    assert_no_table_scan(plan)
+    assert any("ix_bookings_room_id_start_time_end_time (room_id=? AND start_time<?)" in step
+               for step in plan), plan
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"room_id": 3},
+    {"user_id": 1},
+    {"start_time": "19-10-2024 10:00"},
+    {"end_time": "19-11-2024 12:00"},
+    {"room_id": 3, "start_time": "19-10-2024 10:00", "end_time": "19-11-2024 12:00"},
+])
+def test_read_bookings_filters_use_index(plan_db, filters):
+    current_user = User(id=1, email="test@example.com")
+    query = filter_bookings(plan_db.query(Booking), current_user, **filters)
+    count_query = select(func.count()).select_from(query.statement.subquery())
+
+    assert_no_table_scan(query_plan(plan_db, query))
+    assert_no_table_scan(query_plan(plan_db, count_query))
+
+
+def test_available_rooms_anti_join_uses_indexes(plan_db):
+    query = available_rooms_query(plan_db, 1, datetime(2024, 10, 19, 10, 0), datetime(2024, 10, 19, 11, 0),
+                                  min_capacity=6)
+    plan = query_plan(plan_db, query)
+    assert_no_table_scan(plan)
+    assert not any(step.startswith("SCAN rooms") for step in plan), plan
+
+
+def test_booking_keyset_page_walks_the_user_index(plan_db):
+    current_user = User(id=1, email="test@example.com")
+    query = filter_bookings(plan_db.query(Booking), current_user, room_id=3)
+    query = query.filter(after([Booking.start_time, Booking.id], [datetime(2024, 10, 19, 10, 0), 42]))
+    plan = query_plan(plan_db, query.order_by(Booking.start_time, Booking.id).limit(51))
+    assert_no_table_scan(plan)
+    assert not any("TEMP B-TREE" in step for step in plan), plan
@@ -0,0 +1,83 @@
+from sqlalchemy import event
+
+from app.read_cache import ReadCache
+from test.conftest import engine
+
+
+def count_queries(table):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if f"FROM {table}" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_read_cache_evicts_and_skips_stale_fills():
+    cache = ReadCache(maxsize=2)
+    for key in "abc":
+        cache.put("rooms", key, 0, ("etag", key.encode()))
+    assert cache.get("rooms", "a") is None
+    assert cache.get("rooms", "c") == ("etag", b"c")
+
+    generation = cache.generation("rooms")
+    cache.invalidate("rooms")
+    cache.put("rooms", "d", generation, ("etag", b"d"))
+    assert cache.get("rooms", "c") is None
+    assert cache.get("rooms", "d") is None
+
+
+def test_read_cache_entries_expire():
+    cache = ReadCache(maxsize=2, ttl=5)
+    cache.put("offices", "a", 0, ("etag", b"a"), now=100.0)
+    assert cache.get("offices", "a", now=104.9) == ("etag", b"a")
+    assert cache.get("offices", "a", now=105.0) is None
+
+    cache = ReadCache(maxsize=2, ttl=5, ttls={"utilization": None})
+    cache.put("utilization", "a", 0, ("etag", b"a"), now=100.0)
+    assert cache.get("utilization", "a", now=100000.0) == ("etag", b"a")
+
+
+def test_office_reads_are_cached_with_etags(client, test_office, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    first = client.get(f"/offices/{test_office.id}", headers=headers)
+    assert first.status_code == 200
+    assert first.json() == {"name": "Test Office", "location": "Test Location", "id": test_office.id}
+    etag = first.headers["etag"]
+
+    statements, stop = count_queries("offices")
+    try:
+        again = client.get(f"/offices/{test_office.id}", headers=headers)
+        not_modified = client.get(f"/offices/{test_office.id}", headers={**headers, "If-None-Match": etag})
+    finally:
+        stop()
+    assert statements == []
+    assert again.content == first.content
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    client.put(f"/offices/{test_office.id}", headers=headers, json={"name": "Renamed", "location": "Test Location"})
+    changed = client.get(f"/offices/{test_office.id}", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["name"] == "Renamed"
+    assert changed.headers["etag"] != etag
+
+
+def test_room_list_is_invalidated_by_writes(client, test_office, test_room, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    office_id, room_id = test_office.id, test_room.id
+    path = f"/rooms/?office_id={office_id}"
+    assert client.get(path, headers=headers).json()["total"] == 1
+    etag = client.get(path, headers=headers).headers["etag"]
+
+    client.post("/rooms/", headers=headers, json={"name": "Second", "capacity": 4, "office_id": office_id})
+    listing = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert listing.status_code == 200
+    assert listing.json()["total"] == 2
+
+    client.delete(f"/offices/{office_id}", headers=headers)
+    assert client.get(path, headers=headers).json()["total"] == 0
+    assert client.get(f"/rooms/{room_id}", headers=headers).status_code == 404
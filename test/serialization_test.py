@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi_pagination import Page, Params
+
+from app.models import Booking, Office, Room
+from app.pagination import format_datetime
+from app.schemas import Booking as BookingSchema, Office as OfficeSchema, Room as RoomSchema
+
+
+def pydantic_page(schema, rows, total, page=1, size=50):
+    # What the Page[...] response models produced before the fast path.
+    model = Page[schema].create([schema.model_validate(row) for row in rows], Params(page=page, size=size),
+                                total=total)
+    return JSONResponse(model.model_dump(mode="json")).body
+
+
+def test_format_datetime_matches_strftime():
+    for value in (datetime(2030, 1, 7, 9, 5), datetime(999, 12, 31, 23, 59), datetime(2024, 10, 19)):
+        assert format_datetime(value) == value.strftime('%d-%m-%Y %H:%M')
+
+
+def test_list_endpoints_match_pydantic_output(client, test_db, test_office, test_user, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    office = Office(name='Zürich "Nord" \\ 東京', location="Line\nbreak")
+    test_db.add(office)
+    test_db.commit()
+    rooms = [Room(name="Ω room", capacity=None, office_id=office.id),
+             Room(name="Big room", capacity=40, office_id=test_office.id)]
+    test_db.add_all(rooms)
+    test_db.commit()
+    start_time = datetime(2030, 1, 7, 9, 0)
+    bookings = [Booking(room_id=rooms[i % 2].id, user_id=test_user.id, start_time=start_time + timedelta(days=i),
+                        end_time=start_time + timedelta(days=i, minutes=45), series_id="abc" if i % 2 else None)
+                for i in range(5)]
+    test_db.add_all(bookings)
+    test_db.commit()
+
+    offices = test_db.query(Office).order_by(Office.id).all()
+    assert client.get("/offices/", headers=headers).content == pydantic_page(OfficeSchema, offices, 2)
+    all_rooms = test_db.query(Room).order_by(Room.id).all()
+    assert client.get("/rooms/", headers=headers).content == pydantic_page(RoomSchema, all_rooms, 2)
+    assert client.get("/bookings/", headers=headers).content == pydantic_page(BookingSchema, bookings, 5)
+    second = client.get("/bookings/", params={"page": 2, "size": 2}, headers=headers)
+    assert second.content == pydantic_page(BookingSchema, bookings[2:4], 5, page=2, size=2)
+    filtered = client.get("/rooms/", params={"office_id": 999}, headers=headers)
+    assert filtered.content == pydantic_page(RoomSchema, [], 0)
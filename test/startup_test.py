@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Roughly twice what `import app.main` takes on a laptop; a heavy eager import blows through it.
+IMPORT_BUDGET_SECONDS = 2.5
+DEFERRED_MODULES = ("jose", "passlib", "bcrypt", "aiosqlite")
+
+IMPORT_APP = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+print(json.dumps({"seconds": time.perf_counter() - started,
+                  "loaded": [name for name in %r if name in sys.modules]}))
+"""
+
+
+def import_app(directory, **env):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(directory, 'cold.db')}", **env,
+               PYTHONPATH=os.pathsep.join(filter(None, [REPO, os.environ.get("PYTHONPATH")])))
+    output = subprocess.run([sys.executable, "-c", IMPORT_APP % (DEFERRED_MODULES,)], env=env, cwd=directory,
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_importing_the_app_stays_cheap(tmp_path):
+    # Best of three, so one slow run on a busy machine does not fail the build.
+    runs = [import_app(str(tmp_path), DATABASE_CREATE_SCHEMA="true") for _ in range(3)]
+
+    assert min(run["seconds"] for run in runs) < IMPORT_BUDGET_SECONDS
+    assert runs[0]["loaded"] == []
+    # Schema creation waits for the lifespan, so importing never touches the database.
+    assert not (tmp_path / "cold.db").exists()
+
+
+def test_lifespan_creates_the_schema_when_asked(tmp_path, monkeypatch):
+    from app import main
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    monkeypatch.setattr(main, "engine", engine)
+    monkeypatch.setattr(main, "DATABASE_CREATE_SCHEMA", True)
+    monkeypatch.setattr(main, "BOOKING_ARCHIVE_INTERVAL_SECONDS", 0)
+    with TestClient(main.app):
+        assert {"users", "bookings", "bookings_archive"} <= set(inspect(engine).get_table_names())
+    assert set(main.startup.phases) >= {"imports", "logging", "app", "schema"}
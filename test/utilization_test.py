@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from app.models import Booking, Room
+
+WEEK = {"start": "06-01-2020 00:00", "end": "13-01-2020 00:00"}
+
+
+def test_utilization_buckets_clipped_bookings(client, test_db, test_office, test_room, test_user, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    test_db.add(Room(name="Empty Room", capacity=4, office_id=test_office.id))
+    test_db.add_all([
+        Booking(room_id=test_room.id, user_id=test_user.id,
+                start_time=datetime(2020, 1, 6, 9, 30), end_time=datetime(2020, 1, 6, 11, 0)),
+        # Runs past the end of the range; only Sunday 23:00-24:00 counts.
+        Booking(room_id=test_room.id, user_id=test_user.id,
+                start_time=datetime(2020, 1, 12, 23, 0), end_time=datetime(2020, 1, 13, 1, 0)),
+    ])
+    test_db.commit()
+
+    response = client.get(f"/offices/{test_office.id}/utilization", params=WEEK, headers=headers)
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["start_time"], report["booked_minutes"], report["occupancy"]) == ("06-01-2020 00:00", 150, 0.74)
+    assert report["by_hour"][10] == 7.14
+    room, empty = report["rooms"]
+    assert (room["room_id"], room["booked_minutes"], room["occupancy"]) == (test_room.id, 150, 1.49)
+    assert (room["by_hour"][9], room["by_hour"][10], room["by_hour"][23]) == (7.14, 14.29, 14.29)
+    assert (room["by_weekday"][0], room["by_weekday"][6]) == (6.25, 4.17)
+    assert (empty["booked_minutes"], empty["occupancy"]) == (0, 0.0)
+
+
+def test_closed_periods_are_cached_until_a_past_booking_changes(client, test_office, test_room, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    url = f"/offices/{test_office.id}/utilization"
+    first = client.get(url, params=WEEK, headers=headers)
+    etag = first.headers["etag"]
+    assert client.get(url, params=WEEK, headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    client.post("/bookings/", headers=headers, json={"room_id": test_room.id, "start_time": "02-01-2031 09:00",
+                                                     "end_time": "02-01-2031 10:00"})
+    assert client.get(url, params=WEEK, headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    client.post("/bookings/", headers=headers, json={"room_id": test_room.id, "start_time": "07-01-2020 09:00",
+                                                     "end_time": "07-01-2020 10:00"})
+    refreshed = client.get(url, params=WEEK, headers={**headers, "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["booked_minutes"] == 60
+
+    open_period = client.get(url, params={"start": "06-01-2020 00:00", "end": "01-01-2040 00:00"}, headers=headers)
+    assert open_period.status_code == 200 and "etag" not in open_period.headers
+    assert client.get("/offices/999/utilization", params=WEEK, headers=headers).status_code == 404